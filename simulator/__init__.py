@@ -1,9 +1,26 @@
-from simulator.strategy import *
+import importlib
 
 __all__ = [
     "sequential_build", "parallel_build", "cached_build", "slim_image_build",
     "round_robin_load", "least_connections_load", "random_load",
-    "genetic_algorithm_load", "irb_load", "rrb_load",
+    "genetic_algorithm_load", "irb_load", "ServiceCaps", "rrb_load",
     "iot_lb_load", "tl_lb_load",
     "fcfs_scheduling", "sjf_scheduling", "srtf_scheduling", "hrrn_scheduling"
 ]
+
+# Strategies are imported on first access (PEP 562), so `import simulator`
+# stays cheap for callers that only need one submodule.
+_LAZY = {name: "simulator.strategy" for name in __all__}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
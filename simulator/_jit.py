@@ -0,0 +1,17 @@
+# =========================================================
+# OPTIONAL NUMBA SUPPORT
+# =========================================================
+# Numeric kernels are written as plain loops over NumPy arrays and decorated
+# with `njit`. When numba is installed they are compiled to machine code;
+# otherwise the decorator is a no-op and the same code runs as Python.
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
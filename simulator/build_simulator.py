@@ -1,31 +1,20 @@
+import argparse
+import atexit
+import cmd
 import csv
+import functools
+import importlib.util
 import os
-import random
-from typing import List, Dict
-
-from simulator.strategy import (
-    # Build
-    sequential_build,
-    parallel_build,
-    cached_build,
-    slim_image_build,
-
-    # Load Balancing
-    round_robin_load,
-    least_connections_load,
-    random_load,
-    genetic_algorithm_load,
-    irb_load,
-    rrb_load,
-    iot_lb_load,
-    tl_lb_load,
-
-    # Scheduling
-    fcfs_scheduling,
-    sjf_scheduling,
-    srtf_scheduling,
-    hrrn_scheduling,
-)
+import queue
+import re
+import sys
+import threading
+import time
+from typing import List, Dict, Tuple
+
+# Strategies are resolved lazily through the package __getattr__ and numpy is
+# imported on the first scheduling run, so navigating the menu stays cheap.
+import simulator
 
 # =================================================
 # CSV LOGGING
@@ -34,50 +23,211 @@ from simulator.strategy import (
 os.makedirs("logs", exist_ok=True)
 LOG_FILE = os.path.join("logs", "results.csv")
 
-CSV_HEADERS = [
+CSV_HEADERS = (
     "phase", "strategy", "algorithm",
     "total_time", "speedup", "efficiency",
     "avg_load", "max_load", "min_load", "variance",
     "fairness_index", "load_imbalance",
     "avg_waiting", "avg_turnaround", "avg_response",
-]
+)
+
+# Fixed precision per float column, applied once when the row is written
+_FMT = {
+    "speedup": "{:.2f}".format,
+    "efficiency": "{:.2f}".format,
+    "avg_load": "{:.2f}".format,
+    "variance": "{:.2f}".format,
+    "fairness_index": "{:.4f}".format,
+    "load_imbalance": "{:.2f}".format,
+    "avg_waiting": "{:.2f}".format,
+    "avg_turnaround": "{:.2f}".format,
+    "avg_response": "{:.2f}".format,
+}
+# header -> (position in the row, formatter or None)
+_COLUMNS = {h: (i, _FMT.get(h)) for i, h in enumerate(CSV_HEADERS)}
+_BLANK_ROW = ("",) * len(CSV_HEADERS)
+
+_LOG_FH = None
+_WRITER = None
+
+def _log_writer():
+    # Opened once per process; rows are buffered and written in order of CSV_HEADERS
+    global _LOG_FH, _WRITER
+    if _WRITER is None:
+        _LOG_FH = open(LOG_FILE, "a", newline="", buffering=1 << 16)
+        _WRITER = csv.writer(_LOG_FH)
+        # An append-mode handle starts at EOF, so this also covers empty files
+        if _LOG_FH.tell() == 0:
+            _WRITER.writerow(CSV_HEADERS)
+    return _WRITER
+
+# SIM_LOG_FORMAT=parquet buffers rows and writes them as Parquet row groups
+# (requires pyarrow); each process writes its own logs/results-<time>-<pid>.parquet
+LOG_FORMAT = os.environ.get("SIM_LOG_FORMAT", "csv").lower()
+PARQUET_BATCH_ROWS = 10_000
+_TEXT_COLUMNS = ("phase", "strategy", "algorithm")
+
+_PQ_ROWS = []
+_PQ_WRITER = None
+
+def _parquet_writer():
+    global _PQ_WRITER
+    if _PQ_WRITER is None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("SIM_LOG_FORMAT=parquet requires pyarrow (pip install pyarrow)") from None
+        schema = pa.schema([(h, pa.string() if h in _TEXT_COLUMNS else pa.float64())
+                            for h in CSV_HEADERS])
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(os.path.dirname(LOG_FILE), f"results-{stamp}-{os.getpid()}.parquet")
+        _PQ_WRITER = pq.ParquetWriter(path, schema)
+    return _PQ_WRITER
+
+def _flush_parquet():
+    if _PQ_ROWS:
+        import pyarrow as pa
+        writer = _parquet_writer()
+        writer.write_table(pa.Table.from_pylist(_PQ_ROWS, schema=writer.schema))
+        _PQ_ROWS.clear()
+
+def _close_parquet():
+    global _PQ_WRITER
+    _flush_parquet()
+    if _PQ_WRITER is not None:
+        _PQ_WRITER.close()
+        _PQ_WRITER = None
+
+if LOG_FORMAT == "parquet":
+    atexit.register(_close_parquet)
+
+def _format_row(data: Dict) -> List:
+    # Only the keys a row actually carries are visited; unknown keys are dropped
+    row = list(_BLANK_ROW)
+    for k, v in data.items():
+        col = _COLUMNS.get(k)
+        if col is not None:
+            i, fmt = col
+            row[i] = v if fmt is None or v == "" else fmt(v)
+    return row
+
+# CSV rows are formatted and written by a daemon thread, so callers only
+# pay for a queue put; flush_results() waits for the queue to drain
+_ROW_Q = None
+_WRITE_ERROR = None
+
+def _writer_loop(q: queue.Queue):
+    global _WRITE_ERROR
+    while True:
+        rows = q.get()
+        try:
+            _log_writer().writerows(map(_format_row, rows))
+        except Exception as e:
+            _WRITE_ERROR = e
+        finally:
+            q.task_done()
+
+def _row_queue() -> queue.Queue:
+    global _ROW_Q
+    if _ROW_Q is None:
+        _ROW_Q = queue.Queue()
+        threading.Thread(target=_writer_loop, args=(_ROW_Q,),
+                         name="results-writer", daemon=True).start()
+    return _ROW_Q
+
+def _close_log():
+    flush_results()
+    if _LOG_FH is not None:
+        _LOG_FH.close()
+
+atexit.register(_close_log)
 
 def save_results(data: Dict):
-    exists = os.path.isfile(LOG_FILE)
-    with open(LOG_FILE, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-        if not exists:
-            writer.writeheader()
-        writer.writerow({k: data.get(k, "") for k in CSV_HEADERS})
+    save_results_many((data,))
+
+def save_results_many(rows) -> None:
+    """Append several result rows with one writerows call."""
+    if LOG_FORMAT == "parquet":
+        _PQ_ROWS.extend(rows)
+        if len(_PQ_ROWS) >= PARQUET_BATCH_ROWS:
+            _flush_parquet()
+        return
+
+    _row_queue().put(list(rows))
+
+def flush_results():
+    global _WRITE_ERROR
+    if LOG_FORMAT == "parquet":
+        _flush_parquet()
+    if _ROW_Q is not None:
+        _ROW_Q.join()
+    if _WRITE_ERROR is not None:
+        err, _WRITE_ERROR = _WRITE_ERROR, None
+        raise err
+    if _LOG_FH is not None and not _LOG_FH.closed:
+        _LOG_FH.flush()
 
 # =================================================
 # INPUT HELPERS
 # =================================================
 
+# Scenario files piped into the menu may be annotated with "# ..." lines;
+# those are skipped and malformed values are rejected without raising
+_INT_RE = re.compile(r"[+-]?\d+")
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
 def _read_int(prompt: str, default: int = None) -> int:
     while True:
-        try:
-            s = input(prompt)
-            if s == "" and default is not None:
-                return default
+        s = input(prompt).strip()
+        if s.startswith("#"):
+            continue
+        if s == "" and default is not None:
+            return default
+        if _INT_RE.fullmatch(s):
             return int(s)
-        except ValueError:
-            print("Enter a valid integer.")
+        print("Enter a valid integer.")
 
 def _read_float(prompt: str, default: float = None) -> float:
     while True:
-        try:
-            s = input(prompt)
-            if s == "" and default is not None:
-                return default
+        s = input(prompt).strip()
+        if s.startswith("#"):
+            continue
+        if s == "" and default is not None:
+            return default
+        if _FLOAT_RE.fullmatch(s):
             return float(s)
-        except ValueError:
-            print("Enter a valid number.")
+        print("Enter a valid number.")
 
 # =================================================
 # BUILD PHASE
 # =================================================
 
+_BUILD_DISPATCH = {
+    1: lambda n, t, changed, factor: simulator.sequential_build(n, t),
+    2: lambda n, t, changed, factor: simulator.parallel_build(n, t),
+    3: lambda n, t, changed, factor: simulator.cached_build(n, t, changed),
+    4: lambda n, t, changed, factor: simulator.slim_image_build(n, t, factor),
+}
+
+def _run_build(choice: int, n: int, t: int, changed: int = 0, factor: float = 0.7) -> Dict:
+    fn = _BUILD_DISPATCH.get(choice)
+    if fn is None:
+        return None
+    return fn(n, t, changed, factor)
+
+def _build_row(r: Dict) -> Dict:
+    return {
+        "phase": "Build",
+        "strategy": r["strategy"],
+        "total_time": r["total_time"],
+        "speedup": r["speedup"],
+        "efficiency": r["efficiency"]
+    }
+
+def _build_summary(r: Dict) -> str:
+    return f"{r['strategy']} | Time={r['total_time']} | Speedup={r['speedup']}"
+
 def build_phase():
     print("\n--- CI/CD Build Simulator ---\n")
     n = _read_int("Enter number of services: ")
@@ -86,65 +236,117 @@ def build_phase():
     print("\n1. Sequential\n2. Parallel\n3. Cached\n4. Slim Image")
     c = _read_int("Choice: ")
 
-    if c == 1:
-        r = sequential_build(n, t)
-    elif c == 2:
-        r = parallel_build(n, t)
-    elif c == 3:
+    changed, factor = 0, 0.7
+    if c == 3:
         changed = _read_int("Changed services: ", 0)
-        r = cached_build(n, t, changed)
     elif c == 4:
         factor = _read_float("Slim factor (0.7): ", 0.7)
-        r = slim_image_build(n, t, factor)
-    else:
+
+    r = _run_build(c, n, t, changed, factor)
+    if r is None:
         return
 
-    print(f"\n{r['strategy']} | Time={r['total_time']} | Speedup={r['speedup']}")
-    save_results({
-        "phase": "Build",
-        "strategy": r["strategy"],
-        "total_time": r["total_time"],
-        "speedup": r["speedup"],
-        "efficiency": r["efficiency"]
-    })
+    save_results(_build_row(r))
+
+    sys.stdout.write("\n" + _build_summary(r) + "\n")
 
 # =================================================
 # LOAD BALANCING PHASE
 # =================================================
 
-def _collect_service_caps(n: int) -> List[Dict[str, float]]:
+def _collect_service_caps(n: int):
+    # Returns a simulator.ServiceCaps (one float32 array per field)
     print("\nIRB Capacities (Enter = default, Ctrl+C = auto)")
-    caps = []
+    cols = ([], [], [], [])
     try:
         for i in range(n):
-            print(f"\nInstance {i}")
-            caps.append({
-                "cpu_capacity": _read_float(" CPU cap (10): ", 10),
-                "mem_capacity": _read_float(" MEM cap (8): ", 8),
-                "cpu_cost": _read_float(" CPU cost (1): ", 1),
-                "mem_cost": _read_float(" MEM cost (1): ", 1),
-            })
+            cols[0].append(_read_float(f"\nInstance {i}\n CPU cap (10): ", 10))
+            cols[1].append(_read_float(" MEM cap (8): ", 8))
+            cols[2].append(_read_float(" CPU cost (1): ", 1))
+            cols[3].append(_read_float(" MEM cost (1): ", 1))
     except KeyboardInterrupt:
         print("\n⚠️ Using default capacities for all instances.")
-        caps = [{"cpu_capacity":10,"mem_capacity":8,"cpu_cost":1,"mem_cost":1} for _ in range(n)]
-    return caps
+        return _default_service_caps(n)
+    import numpy as np
+    return simulator.ServiceCaps(*(np.asarray(c, dtype=np.float32) for c in cols))
+
+def _default_service_caps(n: int):
+    return simulator.ServiceCaps.full(n)
 
 def _collect_iot_signals(n: int) -> List[Dict[str, float]]:
     print("\nIoT Signals (Ctrl+C = auto/default)")
     signals = []
     try:
         for i in range(n):
-            print(f"\nInstance {i}")
             signals.append({
-                "latency": _read_float(" Latency ms (50): ", 50),
+                "latency": _read_float(f"\nInstance {i}\n Latency ms (50): ", 50),
                 "network_delay": _read_float(" Network delay ms (20): ", 20),
                 "cpu_temp": _read_float(" CPU temp °C (65): ", 65),
             })
     except KeyboardInterrupt:
         print("\n⚠️ Using default IoT signals.")
-        signals = [{"latency":50,"network_delay":20,"cpu_temp":65} for _ in range(n)]
+        signals = _default_iot_signals(n)
     return signals
 
+def _default_iot_signals(n: int) -> List[Dict[str, float]]:
+    return [{"latency":50,"network_delay":20,"cpu_temp":65} for _ in range(n)]
+
+@functools.lru_cache(maxsize=32)
+def _idle_loads(n: int) -> Tuple[int, ...]:
+    # Shared, immutable starting loads; least_connections_load copies its input
+    return (0,) * n
+
+_LB_DISPATCH = {
+    1: lambda r, n, caps, signals, q: simulator.round_robin_load(r, n),
+    2: lambda r, n, caps, signals, q: simulator.least_connections_load(r, _idle_loads(n)),
+    3: lambda r, n, caps, signals, q: simulator.random_load(r, n),
+    4: lambda r, n, caps, signals, q: simulator.genetic_algorithm_load(r, n),
+    5: lambda r, n, caps, signals, q: simulator.irb_load(r, caps if caps is not None else _default_service_caps(n)),
+    6: lambda r, n, caps, signals, q: simulator.rrb_load(r, n),
+    7: lambda r, n, caps, signals, q: simulator.iot_lb_load(r, signals if signals is not None else _default_iot_signals(n)),
+    8: lambda r, n, caps, signals, q: simulator.tl_lb_load(r, n, q if q is not None else [1.0]*n),
+}
+
+def _run_lb(choice: int, n: int, r: int, caps=None,
+            signals: List[Dict[str, float]] = None, q: List[float] = None) -> Dict:
+    fn = _LB_DISPATCH.get(choice)
+    if fn is None:
+        return None
+    return fn(r, n, caps, signals, q)
+
+def _lb_row(res: Dict) -> Dict:
+    return {
+        "phase": "LoadBalancing",
+        "algorithm": res["algorithm"],
+        "avg_load": res["average_load"],
+        "max_load": res["max_load"],
+        "min_load": res["min_load"],
+        "variance": res["variance"],
+        "fairness_index": res["fairness_index"],
+        "load_imbalance": res["load_imbalance"],
+    }
+
+def _lb_summary(res: Dict) -> str:
+    return f"{res['algorithm']} | AvgLoad={res['average_load']:.2f}"
+
+def _distribution_preview(distribution, limit: int = 20, block: int = 4096) -> str:
+    import numpy as np
+    dist = np.asarray(distribution)
+    busy = np.count_nonzero(dist)
+    if busy == 0:
+        return "Busy services: none"
+    # Only locate the first `limit` busy services, block by block, instead of
+    # materialising the index of every non-zero entry
+    head = []
+    for start in range(0, dist.size, block):
+        head.extend((np.flatnonzero(dist[start:start + block]) + start).tolist())
+        if len(head) >= limit:
+            break
+    head = head[:limit]
+    pairs = ", ".join(f"{i}:{v}" for i, v in zip(head, dist[head].tolist()))
+    more = f" (+{busy - limit} more)" if busy > limit else ""
+    return f"Busy services (id:load): {pairs}{more}"
+
 def load_balancing_phase():
     print("\n--- Load Balancing ---\n")
     n = _read_int("Services: ")
@@ -162,84 +364,297 @@ def load_balancing_phase():
 """)
     c = _read_int("Choice: ")
 
-    if c == 1:
-        res = round_robin_load(r, n)
-    elif c == 2:
-        res = least_connections_load(r, [0]*n)
-    elif c == 3:
-        res = random_load(r, n)
-    elif c == 4:
-        res = genetic_algorithm_load(r, n)
-    elif c == 5:
-        res = irb_load(r, _collect_service_caps(n))
-    elif c == 6:
-        res = rrb_load(r, n)
+    caps = signals = q = None
+    if c == 5:
+        caps = _collect_service_caps(n)
     elif c == 7:
-        res = iot_lb_load(r, _collect_iot_signals(n))
+        signals = _collect_iot_signals(n)
     elif c == 8:
         q = list(map(float, input("Pretrained Q-values (comma): ").split(",")))
-        res = tl_lb_load(r, n, q)
-    else:
+
+    res = _run_lb(c, n, r, caps, signals, q)
+    if res is None:
         return
 
-    print(f"\n{res['algorithm']} | AvgLoad={res['average_load']:.2f}")
-    save_results({
-        "phase": "LoadBalancing",
-        "algorithm": res["algorithm"],
-        "avg_load": res["average_load"],
-        "max_load": res["max_load"],
-        "min_load": res["min_load"],
-        "variance": res["variance"],
-        "fairness_index": res["fairness_index"],
-        "load_imbalance": res["load_imbalance"],
-    })
+    save_results(_lb_row(res))
+
+    sys.stdout.write("\n" + _lb_summary(res) + "\n" + _distribution_preview(res["distribution"]) + "\n")
 
 # =================================================
 # SCHEDULING PHASE
 # =================================================
 
-def scheduling_phase():
-    print("\n--- Scheduling ---\n")
-    n = _read_int("Jobs: ")
-    arrival = [random.randint(0,50) for _ in range(n)]
-    burst = [random.randint(1,20) for _ in range(n)]
+_SCHED_ALGOS = {
+    1: ("FCFS", "fcfs_scheduling"),
+    2: ("SJF", "sjf_scheduling"),
+    3: ("SRTF", "srtf_scheduling"),
+    4: ("HRRN", "hrrn_scheduling"),
+}
 
-    print("1.FCFS 2.SJF 3.SRTF 4.HRRN")
-    c = _read_int("Choice: ")
+_RNG = None
 
-    algos = {
-        1: ("FCFS", fcfs_scheduling),
-        2: ("SJF", sjf_scheduling),
-        3: ("SRTF", srtf_scheduling),
-        4: ("HRRN", hrrn_scheduling),
-    }
-    if c not in algos:
-        return
+def _rng(seed: int = None):
+    global _RNG
+    import numpy as np
+    if seed is not None:
+        return np.random.default_rng(seed)
+    if _RNG is None:
+        _RNG = np.random.default_rng()
+    return _RNG
 
-    name, fn = algos[c]
-    res = fn(arrival, burst)
+def _run_scheduling(n: int, choice: int, seed: int = None, jobs: Tuple = None) -> Dict:
+    # `jobs` is an (arrival, burst) pair; without it a random workload of n jobs is drawn
+    if choice not in _SCHED_ALGOS:
+        return None
 
-    print(f"{name} | Avg WT={res['avg_waiting']:.2f}")
-    save_results({
+    if jobs is not None:
+        arrival, burst = jobs
+    else:
+        rng = _rng(seed)
+        # Drawn as int64, the schedulers' native dtype, so they use them uncopied
+        arrival = rng.integers(0, 51, size=n, dtype="int64")
+        burst = rng.integers(1, 21, size=n, dtype="int64")
+
+    name, fn = _SCHED_ALGOS[choice]
+    res = getattr(simulator, fn)(arrival, burst)
+    res["algorithm"] = name
+    return res
+
+def _sched_row(res: Dict) -> Dict:
+    return {
         "phase": "Scheduling",
-        "algorithm": name,
+        "algorithm": res["algorithm"],
         "avg_waiting": res["avg_waiting"],
         "avg_turnaround": res["avg_turnaround"],
         "avg_response": res["avg_response"],
-    })
+    }
+
+def _sched_summary(res: Dict) -> str:
+    return f"{res['algorithm']} | Avg WT={res['avg_waiting']:.2f}"
+
+def _bulk_read_pairs(stream) -> Tuple[List[int], List[int]]:
+    # Whole stream in one read: "arrival burst" pairs separated by commas or
+    # whitespace, "#" comment lines skipped. Only the first remaining line may
+    # be a header, and only if none of its fields is an integer
+    tokens = []
+    first = True
+    for line in stream.read().splitlines():
+        if line.lstrip().startswith("#"):
+            continue
+        fields = line.replace(",", " ").split()
+        if first and fields:
+            first = False
+            if not any(_INT_RE.fullmatch(t) for t in fields):
+                continue
+        tokens.extend(fields)
+    try:
+        values = list(map(int, tokens))
+    except ValueError:
+        bad = next(t for t in tokens if not _INT_RE.fullmatch(t))
+        raise ValueError(f"jobs input holds a non-integer value: {bad!r}") from None
+    if len(values) % 2:
+        raise ValueError("jobs input must hold arrival/burst pairs")
+    return values[0::2], values[1::2]
+
+def _load_jobs(path: str) -> Tuple[List[int], List[int]]:
+    # "-" reads the jobs from stdin
+    if path == "-":
+        return _bulk_read_pairs(sys.stdin)
+    with open(path) as f:
+        return _bulk_read_pairs(f)
+
+def scheduling_phase(arrival_times: List[int] = None, burst_times: List[int] = None,
+                     choice: int = None):
+    print("\n--- Scheduling ---\n")
+    jobs = None
+    if arrival_times is not None and burst_times is not None:
+        jobs = (arrival_times, burst_times)
+        n = len(arrival_times)
+    else:
+        n = _read_int("Jobs: ")
+
+    if choice is None:
+        print("1.FCFS 2.SJF 3.SRTF 4.HRRN")
+        choice = _read_int("Choice: ")
+
+    res = _run_scheduling(n, choice, jobs=jobs)
+    if res is None:
+        return
+
+    save_results(_sched_row(res))
+
+    sys.stdout.write(_sched_summary(res) + "\n")
+
+# =================================================
+# BATCH MODE
+# =================================================
+
+_BUILD_CHOICES = {"sequential": 1, "parallel": 2, "cached": 3, "slim": 4}
+_LB_CHOICES = {
+    "round-robin": 1, "least-connections": 2, "random": 3, "genetic": 4,
+    "irb": 5, "rrb": 6, "iot": 7, "tl": 8,
+}
+_SCHED_CHOICES = {"fcfs": 1, "sjf": 2, "srtf": 3, "hrrn": 4}
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="python -m simulator.build_simulator",
+        description="Run simulator phases non-interactively.",
+    )
+    p.add_argument("--phase", required=True, choices=["build", "lb", "scheduling"])
+    p.add_argument("--algo", required=True,
+                   help="strategy/algorithm name, e.g. parallel, round-robin, srtf, or 'all'")
+    p.add_argument("--n", type=int, default=None,
+                   help="services (build/lb) or jobs (scheduling)")
+    p.add_argument("--jobs", type=str, default=None,
+                   help="CSV of arrival,burst rows to schedule instead of a random workload ('-' = stdin)")
+    p.add_argument("--time", type=int, default=10, help="avg build time per service")
+    p.add_argument("--changed", type=int, default=0, help="changed services (cached build)")
+    p.add_argument("--factor", type=float, default=0.7, help="slim image factor")
+    p.add_argument("--requests", type=int, default=100, help="requests to balance")
+    p.add_argument("--q", type=str, default=None, help="pretrained Q-values, comma separated (tl)")
+    p.add_argument("--repeat", type=int, default=1)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--workers", type=int, default=1,
+                   help="worker processes for the sweep (0 = one per CPU)")
+    args = p.parse_args(argv)
+
+    if args.jobs is not None and args.phase != "scheduling":
+        p.error("--jobs only applies to --phase scheduling")
+    if args.n is None and args.jobs is None:
+        p.error("--n is required")
+
+    choices = {"build": _BUILD_CHOICES, "lb": _LB_CHOICES, "scheduling": _SCHED_CHOICES}[args.phase]
+    if args.algo == "all":
+        args.choices = list(choices.values())
+    elif args.algo in choices:
+        args.choices = [choices[args.algo]]
+    else:
+        p.error(f"unknown --algo {args.algo!r} for phase {args.phase}: "
+                f"choose from {', '.join(choices)} or all")
+    return args
+
+def _run_one(config: Dict) -> Tuple[Dict, str]:
+    # Top-level so ProcessPoolExecutor can pickle it; returns (csv row, summary line)
+    phase, choice = config["phase"], config["choice"]
+    if config["seed"] is not None:
+        from simulator.strategy import set_seed
+        set_seed(config["seed"])
+    if phase == "build":
+        r = _run_build(choice, config["n"], config["time"], config["changed"], config["factor"])
+        return _build_row(r), _build_summary(r)
+    if phase == "lb":
+        res = _run_lb(choice, config["n"], config["requests"], q=config["q"])
+        return _lb_row(res), _lb_summary(res)
+    res = _run_scheduling(config["n"], choice, config["seed"], config.get("jobs"))
+    return _sched_row(res), _sched_summary(res)
+
+def _run_batch(args: argparse.Namespace):
+    q = list(map(float, args.q.split(","))) if args.q else None
+    jobs = _load_jobs(args.jobs) if args.jobs else None
+    n = len(jobs[0]) if jobs else args.n
+    workers = args.workers if args.workers > 0 else os.cpu_count()
+
+    base_seed = args.seed
+    if base_seed is None and workers > 1:
+        # Forked workers would otherwise share the parent's generator state
+        base_seed = int(_rng().integers(2**31))
+
+    configs = [
+        {"phase": args.phase, "choice": choice, "n": n, "time": args.time,
+         "changed": args.changed, "factor": args.factor, "requests": args.requests,
+         "q": q, "jobs": jobs, "seed": None if base_seed is None else base_seed + i}
+        for i in range(args.repeat)
+        for choice in args.choices
+    ]
+
+    if workers > 1 and len(configs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_run_one, configs,
+                                  chunksize=max(1, len(configs) // (workers * 4))))
+    else:
+        results = [_run_one(c) for c in configs]
+
+    save_results_many([row for row, _ in results])
+    flush_results()
+    sys.stdout.write("\n".join(summary for _, summary in results) + "\n")
 
 # =================================================
 # MAIN
 # =================================================
 
-def main():
-    while True:
-        print("\n1.Build 2.LoadBalancing 3.Scheduling 4.Exit")
-        c = input("Choice: ")
-        if c == "1": build_phase()
-        elif c == "2": load_balancing_phase()
-        elif c == "3": scheduling_phase()
-        elif c == "4": break
+class SimCLI(cmd.Cmd):
+    """
+    Interactive menu. Accepts the numeric choices as well as command names,
+    and reads piped stdin as a script: printf '3\n500\n2\n4\n' | python -m ...
+    """
+    intro = "\n1.Build 2.LoadBalancing 3.Scheduling 4.Exit  (or: build, lb, sched, exit, help)"
+    prompt = "Choice: "
+    _ALIASES = {"1": "build", "2": "lb", "3": "sched", "4": "exit"}
+
+    def do_build(self, arg):
+        """Run the build phase."""
+        build_phase()
+
+    def do_lb(self, arg):
+        """Run the load balancing phase."""
+        load_balancing_phase()
+
+    def do_sched(self, arg):
+        """Run the scheduling phase."""
+        scheduling_phase()
+
+    def do_exit(self, arg):
+        """Leave the simulator."""
+        return True
+
+    def do_EOF(self, arg):
+        """Leave the simulator (Ctrl+D / end of piped input)."""
+        self.stdout.write("\n")
+        return True
+
+    def default(self, line):
+        if line.lstrip().startswith("#"):
+            return False
+        name = self._ALIASES.get(line.strip())
+        if name is None:
+            self.stdout.write(f"Unknown choice: {line}\n")
+            return False
+        return self.onecmd(name)
+
+    def emptyline(self):
+        return False
+
+    def postcmd(self, stop, line):
+        flush_results()
+        return stop
+
+def _numba_available() -> bool:
+    # Located without importing it: numba pulls in numpy, which the menu defers
+    try:
+        return importlib.util.find_spec("numba") is not None
+    except ValueError:
+        return False
+
+def _warm():
+    # Import the strategies and compile the JIT kernels (written to numba's
+    # on-disk cache) while the user is still reading the menu. Without numba
+    # there is nothing to compile, and running the kernels would only race the
+    # user's first seeded run for the kernels' random state
+    from simulator.strategy import warm_kernels, HAVE_NUMBA
+    if HAVE_NUMBA:
+        warm_kernels()
+
+def main(argv: List[str] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        _run_batch(_parse_args(argv))
+        return
+
+    if _numba_available():
+        threading.Thread(target=_warm, name="jit-warmup", daemon=True).start()
+    SimCLI().cmdloop()
 
 if __name__ == "__main__":
     main()
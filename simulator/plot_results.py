@@ -1,8 +1,15 @@
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # batch rendering only, no GUI backend
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import os
+import re
 import sys
 import ast
+import json
+import itertools
 import numpy as np
 
 # -------------------------------------------------
@@ -12,40 +19,180 @@ import numpy as np
 GRAPHS_DIR = "graphs"
 LOG_PATH = "logs/results.csv"
 
-os.makedirs(GRAPHS_DIR, exist_ok=True)
-
-if not os.path.exists(LOG_PATH):
-    print("⚠️ results.csv not found! Run simulator first.")
-    sys.exit(1)
-
-df = pd.read_csv(LOG_PATH)
+plt.rcParams.update({"figure.max_open_warning": 0, "figure.autolayout": True})
+
+# Parsed straight to numeric dtypes by the C engine; blank cells become NA.
+# The label columns are categorical so groupby hashes small integer codes
+LABEL_DTYPES = {"phase": "category", "strategy": "category", "algorithm": "category"}
+DTYPES = {
+    "total_time": "float32", "speedup": "float32", "efficiency": "float32",
+    "avg_load": "float32", "max_load": "Int32", "min_load": "Int32",
+    "variance": "float32", "fairness_index": "float32", "load_imbalance": "float32",
+    "avg_waiting": "float32", "avg_turnaround": "float32", "avg_response": "float32",
+}
+
+# Parsed frame cached as Parquet (needs pyarrow), keyed by the CSV's mtime and size
+CACHE_PATH = "logs/results.parquet"
+CACHE_KEY_PATH = "logs/results.parquet.key"
+
+# Algorithm-name filters for the per-family LB plots, one regex scan each
+FAMILY_PATTERNS = {
+    "IRB": re.compile(r"IRB|Instance Resource"),
+    "RRB": re.compile(r"RRB|Reinforcement"),
+    "TL": re.compile(r"TL"),
+    "IoT": re.compile(r"IoT"),
+}
 
 # -------------------------------------------------
 # HELPERS
 # -------------------------------------------------
 
-def to_numeric_safe(df, cols):
-    for c in cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
+def load_results():
+    st = os.stat(LOG_PATH)
+    key = f"{st.st_mtime_ns} {st.st_size}"
+    try:
+        with open(CACHE_KEY_PATH) as f:
+            if f.read() == key:
+                return pd.read_parquet(CACHE_PATH)
+    except (OSError, ImportError, ValueError):
+        pass
+
+    frame = pd.read_csv(LOG_PATH, dtype={**LABEL_DTYPES, **DTYPES}, engine="c", na_values=[""])
+    # The cache is only an optimisation: a missing or broken parquet engine or
+    # an unwritable directory leaves the CSV frame uncached
+    try:
+        frame.to_parquet(CACHE_PATH, compression="zstd", index=False)
+        with open(CACHE_KEY_PATH, "w") as f:
+            f.write(key)
+    except (ImportError, OSError, ValueError):
+        pass
+    return frame
+
+def phase_means(df):
+    # Per-strategy/algorithm means for every phase in one groupby pass; build
+    # rows are keyed by strategy, LB and scheduling rows by algorithm
+    group_key = df["algorithm"]
+    if "strategy" in df.columns:
+        strategy = df["strategy"]
+        if isinstance(strategy.dtype, pd.CategoricalDtype) and isinstance(group_key.dtype, pd.CategoricalDtype):
+            # fillna between categoricals needs one shared category set
+            labels = strategy.cat.categories.union(group_key.cat.categories)
+            strategy = strategy.cat.set_categories(labels)
+            group_key = group_key.cat.set_categories(labels)
+        group_key = strategy.fillna(group_key)
+    metric_cols = [c for c in DTYPES if c in df.columns]
+    return df.groupby(["phase", group_key.rename("_key")], observed=True)[metric_cols].mean()
+
+def phase_groups(df):
+    # Build/LoadBalancing/Scheduling slices from a single groupby pass instead
+    # of one boolean mask (and copy) per phase; missing phases come back as
+    # an empty frame with the same columns. Plotters only read these.
+    groups = dict(tuple(df.groupby("phase", sort=False, observed=True)))
+    empty_df = df.iloc[:0]
+    return {phase: groups.get(phase, empty_df) for phase in ("Build", "LoadBalancing", "Scheduling")}
+
+def means_for(means, phase, key_name):
+    return means.loc[phase].rename_axis(key_name).reset_index()
+
+def family_rows(lb_df, family):
+    # Nothing to scan for runs without LB rows. On the categorical column
+    # pandas matches each distinct name once and maps the result by code.
+    if lb_df.empty or "algorithm" not in lb_df.columns:
+        return lb_df.iloc[:0]
+    return lb_df[lb_df["algorithm"].str.contains(FAMILY_PATTERNS[family], na=False)]
+
+# Cells holding lists/dicts, decoded once right after loading
+PARSED_COLUMNS = ("service_capacities_summary", "Q_values", "final_Q")
+
+def parse_cell(val):
+    # List/dict cells are written as JSON; older logs hold Python reprs
+    try:
+        return json.loads(val)
+    except ValueError:
+        return ast.literal_eval(val)
+
+def parse_columns(df):
+    # Decode each distinct cell once (runs repeat the same values a lot);
+    # unparseable cells become None and drop out with dropna()
+    for col in PARSED_COLUMNS:
+        if col not in df.columns:
+            continue
+        decoded = {}
+        for val in df[col].dropna().unique():
+            try:
+                decoded[val] = parse_cell(val)
+            except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+                decoded[val] = None
+        df[col] = df[col].map(decoded)
     return df
 
-
-numeric_cols = [
-    "total_time", "speedup", "efficiency",
-    "avg_load", "max_load", "min_load", "variance",
-    "fairness_index", "load_imbalance",
-    "avg_waiting", "avg_turnaround", "avg_response"
-]
-df = to_numeric_safe(df, numeric_cols)
+def pad_ragged(rows):
+    # Ragged lists -> (len(rows), longest) C-contiguous float32 matrix,
+    # NaN-padded; all values land in one masked assignment, not per-row slices
+    lengths = np.fromiter(map(len, rows), dtype=np.intp, count=len(rows))
+    width = int(lengths.max()) if len(rows) else 0
+    arr = np.full((len(rows), width), np.nan, dtype=np.float32)
+    arr[np.arange(width) < lengths[:, None]] = np.fromiter(
+        itertools.chain.from_iterable(rows), dtype=np.float32, count=int(lengths.sum()))
+    return arr
+
+_SHARED_AXES = None
+
+def shared_axes(figsize):
+    # One Agg-backed Figure/Axes, created on first use and cleared between
+    # single-figure plots; it never goes through pyplot's figure registry
+    global _SHARED_AXES
+    if _SHARED_AXES is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        _SHARED_AXES = fig.add_subplot(111)
+    ax = _SHARED_AXES
+    ax.clear()
+    ax.figure.set_size_inches(figsize)
+    return ax
+
+def save_plot(draw, xlabel, ylabel, title, fname, figsize=(8, 5), grid_alpha=0.6, legend=False):
+    # Single-figure plots: `draw(ax)` adds the data, the shared styling and the
+    # save happen here (autolayout stands in for tight_layout)
+    ax = shared_axes(figsize)
+    fig = ax.figure
+    draw(ax)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.grid(True, linestyle="--", alpha=grid_alpha)
+    if legend:
+        ax.legend()
+    fig.savefig(os.path.join(GRAPHS_DIR, fname))
+
+def panel_figure(count, ncols, panel_size):
+    # One figure holding `count` panels, instead of one figure per metric
+    nrows = -(-count // ncols)
+    w, h = panel_size
+    fig, axes = plt.subplots(nrows, ncols, figsize=(w * ncols, h * nrows), squeeze=False)
+    axes = axes.ravel()
+    for ax in axes[count:]:
+        ax.remove()
+    return fig, axes[:count]
+
+def save_panels(fig, axes, fnames):
+    # Each panel is still written to its own PNG, cropped out of the shared figure
+    fig.tight_layout()
+    renderer = fig.canvas.get_renderer()
+    inches = fig.dpi_scale_trans.inverted()
+    for ax, fname in zip(axes, fnames):
+        bbox = ax.get_tightbbox(renderer).transformed(inches).padded(0.1)
+        fig.savefig(os.path.join(GRAPHS_DIR, fname), bbox_inches=bbox)
+    plt.close(fig)
 
 # =====================================================
 # BUILD PHASE
 # =====================================================
 
-build_df = df[df["phase"] == "Build"]
-if not build_df.empty and "strategy" in build_df.columns:
-    bgrp = build_df.groupby("strategy").mean(numeric_only=True).reset_index()
+def plot_build(build_df, means):
+    if build_df.empty or "strategy" not in build_df.columns:
+        return
+    bgrp = means_for(means, "Build", "strategy")
 
     plots = [
         ("total_time", "build_total_time.png", "Total Build Time"),
@@ -53,78 +200,74 @@ if not build_df.empty and "strategy" in build_df.columns:
         ("efficiency", "build_efficiency.png", "Efficiency"),
     ]
 
-    for metric, fname, ylabel in plots:
-        if metric in bgrp.columns:
-            plt.figure(figsize=(8, 5))
-            plt.plot(bgrp["strategy"], bgrp[metric], marker="o")
-            plt.xlabel("Build Strategy")
-            plt.ylabel(ylabel)
-            plt.title(f"Build Phase — {ylabel}")
-            plt.xticks(rotation=45, ha="right")
-            plt.grid(True, linestyle="--", alpha=0.6)
-            plt.tight_layout()
-            plt.savefig(os.path.join(GRAPHS_DIR, fname))
-            plt.close()
+    plots = [p for p in plots if p[0] in bgrp.columns]
+    if plots:
+        fig, axes = panel_figure(len(plots), len(plots), (8, 5))
+        for ax, (metric, fname, ylabel) in zip(axes, plots):
+            ax.plot(bgrp["strategy"], bgrp[metric], marker="o")
+            ax.set_xlabel("Build Strategy")
+            ax.set_ylabel(ylabel)
+            ax.set_title(f"Build Phase — {ylabel}")
+            ax.tick_params(axis="x", labelrotation=45)
+            plt.setp(ax.get_xticklabels(), ha="right")
+            ax.grid(True, linestyle="--", alpha=0.6)
+        save_panels(fig, axes, [p[1] for p in plots])
 
 # =====================================================
 # LOAD BALANCING — CORE METRICS
 # =====================================================
 
-lb_df = df[df["phase"] == "LoadBalancing"]
-if not lb_df.empty and "algorithm" in lb_df.columns:
-    lb_grp = lb_df.groupby("algorithm").mean(numeric_only=True).reset_index()
-
-    def bar_plot(metric, fname, ylabel):
-        if metric in lb_grp.columns:
-            plt.figure(figsize=(9, 5))
-            plt.bar(lb_grp["algorithm"], lb_grp[metric], edgecolor="black")
-            plt.xlabel("Load Balancing Algorithm")
-            plt.ylabel(ylabel)
-            plt.title(f"Load Balancing — {ylabel}")
-            plt.xticks(rotation=45, ha="right")
-            plt.grid(axis="y", linestyle="--", alpha=0.6)
-            plt.tight_layout()
-            plt.savefig(os.path.join(GRAPHS_DIR, fname))
-            plt.close()
-
-    bar_plot("avg_load", "lb_avg_load.png", "Average Load")
-    bar_plot("variance", "lb_variance.png", "Variance")
-    bar_plot("fairness_index", "lb_fairness.png", "Fairness Index")
-    bar_plot("load_imbalance", "lb_imbalance.png", "Load Imbalance")
+def plot_lb(lb_df, means):
+    if lb_df.empty or "algorithm" not in lb_df.columns:
+        return
+    lb_grp = means_for(means, "LoadBalancing", "algorithm")
+
+    plots = [
+        ("avg_load", "lb_avg_load.png", "Average Load"),
+        ("variance", "lb_variance.png", "Variance"),
+        ("fairness_index", "lb_fairness.png", "Fairness Index"),
+        ("load_imbalance", "lb_imbalance.png", "Load Imbalance"),
+    ]
+    plots = [p for p in plots if p[0] in lb_grp.columns]
+    if plots:
+        fig, axes = panel_figure(len(plots), 2, (9, 5))
+        for ax, (metric, fname, ylabel) in zip(axes, plots):
+            ax.bar(lb_grp["algorithm"], lb_grp[metric], edgecolor="black")
+            ax.set_xlabel("Load Balancing Algorithm")
+            ax.set_ylabel(ylabel)
+            ax.set_title(f"Load Balancing — {ylabel}")
+            ax.tick_params(axis="x", labelrotation=45)
+            plt.setp(ax.get_xticklabels(), ha="right")
+            ax.grid(axis="y", linestyle="--", alpha=0.6)
+        save_panels(fig, axes, [p[1] for p in plots])
 
 # =====================================================
 # IRB — RESOURCE CAPACITY ANALYSIS
 # =====================================================
 
-if "service_capacities_summary" in lb_df.columns:
-    irb_rows = lb_df[lb_df["algorithm"].str.contains("IRB", na=False)]
+def plot_irb(lb_df):
+    if lb_df.empty or "service_capacities_summary" not in lb_df.columns:
+        return
+    irb_rows = family_rows(lb_df, "IRB")
 
     cpu_all, mem_all = [], []
 
-    for val in irb_rows["service_capacities_summary"].dropna():
+    for parsed in irb_rows["service_capacities_summary"].dropna():
         try:
-            parsed = ast.literal_eval(val)
             cpu_all.append([d.get("cpu_capacity", 0) for d in parsed])
             mem_all.append([d.get("mem_capacity", 0) for d in parsed])
         except Exception:
             pass
 
     if cpu_all:
-        max_len = max(len(x) for x in cpu_all)
-        cpu_arr = np.array([x + [np.nan]*(max_len-len(x)) for x in cpu_all])
-        mem_arr = np.array([x + [np.nan]*(max_len-len(x)) for x in mem_all])
-
-        plt.figure(figsize=(8,5))
-        plt.plot(np.nanmean(cpu_arr, axis=0), marker="o", label="CPU Capacity")
-        plt.plot(np.nanmean(mem_arr, axis=0), marker="s", label="Memory Capacity")
-        plt.xlabel("Instance Index")
-        plt.ylabel("Capacity (units)")
-        plt.title("IRB LB — Average Instance Capacities")
-        plt.legend()
-        plt.grid(True, linestyle="--", alpha=0.6)
-        plt.tight_layout()
-        plt.savefig(os.path.join(GRAPHS_DIR, "irb_capacity.png"))
-        plt.close()
+        cpu_arr = pad_ragged(cpu_all)
+        mem_arr = pad_ragged(mem_all)
+
+        def draw(ax):
+            ax.plot(np.nanmean(cpu_arr, axis=0), marker="o", label="CPU Capacity")
+            ax.plot(np.nanmean(mem_arr, axis=0), marker="s", label="Memory Capacity")
+        save_plot(draw, "Instance Index", "Capacity (units)",
+                  "IRB LB — Average Instance Capacities", "irb_capacity.png", legend=True)
 
 # =====================================================
 # RRB & TL — Q-VALUE ANALYSIS
@@ -132,76 +275,86 @@ if "service_capacities_summary" in lb_df.columns:
 
 def plot_q_values(series, fname, title):
     q_all = []
-    for v in series.dropna():
-        try:
-            parsed = ast.literal_eval(v)
-            if isinstance(parsed, list):
-                q_all.append(parsed)
-        except Exception:
-            pass
+    for parsed in series.dropna():
+        if isinstance(parsed, list):
+            q_all.append(parsed)
 
     if q_all:
-        max_len = max(len(x) for x in q_all)
-        q_arr = np.array([x + [np.nan]*(max_len-len(x)) for x in q_all])
-
-        plt.figure(figsize=(8,5))
-        plt.plot(np.nanmean(q_arr, axis=0), marker="o")
-        plt.xlabel("Service Index")
-        plt.ylabel("Q-value")
-        plt.title(title)
-        plt.grid(True, linestyle="--", alpha=0.6)
-        plt.tight_layout()
-        plt.savefig(os.path.join(GRAPHS_DIR, fname))
-        plt.close()
-
-if "Q_values" in lb_df.columns:
-    rrb_rows = lb_df[lb_df["algorithm"].str.contains("RRB", na=False)]["Q_values"]
-    plot_q_values(rrb_rows, "rrb_q_values.png", "RRB LB — Average Q-values")
-
-if "final_Q" in lb_df.columns:
-    tl_rows = lb_df[lb_df["algorithm"].str.contains("TL", na=False)]["final_Q"]
-    plot_q_values(tl_rows, "tl_q_values.png", "TL-based LB — Transferred Q-values")
+        q_arr = pad_ragged(q_all)
+
+        save_plot(lambda ax: ax.plot(np.nanmean(q_arr, axis=0), marker="o"),
+                  "Service Index", "Q-value", title, fname)
+
+def plot_rrb_tl(lb_df):
+    if lb_df.empty:
+        return
+    if "Q_values" in lb_df.columns:
+        rrb_rows = family_rows(lb_df, "RRB")["Q_values"]
+        plot_q_values(rrb_rows, "rrb_q_values.png", "RRB LB — Average Q-values")
+
+    if "final_Q" in lb_df.columns:
+        tl_rows = family_rows(lb_df, "TL")["final_Q"]
+        plot_q_values(tl_rows, "tl_q_values.png", "TL-based LB — Transferred Q-values")
 
 # =====================================================
 # IoT-LB — VARIANCE vs FAIRNESS
 # =====================================================
 
-iot_rows = lb_df[lb_df["algorithm"].str.contains("IoT", na=False)]
-if not iot_rows.empty:
-    plt.figure(figsize=(8,5))
-    plt.scatter(iot_rows["variance"], iot_rows["fairness_index"], alpha=0.7)
-    plt.xlabel("Variance")
-    plt.ylabel("Fairness Index")
-    plt.title("IoT-based LB — Variance vs Fairness")
-    plt.grid(True, linestyle="--", alpha=0.6)
-    plt.tight_layout()
-    plt.savefig(os.path.join(GRAPHS_DIR, "iot_variance_vs_fairness.png"))
-    plt.close()
+def plot_iot(lb_df):
+    iot_rows = family_rows(lb_df, "IoT")
+    if iot_rows.empty:
+        return
+    save_plot(lambda ax: ax.scatter(iot_rows["variance"], iot_rows["fairness_index"], alpha=0.7),
+              "Variance", "Fairness Index", "IoT-based LB — Variance vs Fairness",
+              "iot_variance_vs_fairness.png")
 
 # =====================================================
 # SCHEDULING PHASE
 # =====================================================
 
-sched_df = df[df["phase"] == "Scheduling"]
-if not sched_df.empty and "algorithm" in sched_df.columns:
-    sgrp = sched_df.groupby("algorithm").mean(numeric_only=True).reset_index()
-
-    plt.figure(figsize=(9,6))
-    for col, marker in zip(
-        ["avg_waiting", "avg_turnaround", "avg_response"],
-        ["o", "s", "^"]
-    ):
-        if col in sgrp.columns:
-            plt.plot(sgrp["algorithm"], sgrp[col], marker=marker, label=col)
-
-    plt.xlabel("Scheduling Algorithm")
-    plt.ylabel("Time")
-    plt.title("Scheduling Algorithms — Average Times")
-    plt.xticks(rotation=45, ha="right")
-    plt.grid(True, linestyle="--", alpha=0.3)
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(os.path.join(GRAPHS_DIR, "scheduling_times.png"))
-    plt.close()
-
-print(f"✅ Graphs generated successfully in '{GRAPHS_DIR}/'")
+def plot_scheduling(sched_df, means):
+    if sched_df.empty or "algorithm" not in sched_df.columns:
+        return
+    sgrp = means_for(means, "Scheduling", "algorithm")
+
+    def draw(ax):
+        for col, marker in zip(
+            ["avg_waiting", "avg_turnaround", "avg_response"],
+            ["o", "s", "^"]
+        ):
+            if col in sgrp.columns:
+                ax.plot(sgrp["algorithm"], sgrp[col], marker=marker, label=col)
+        ax.tick_params(axis="x", labelrotation=45)
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment("right")
+
+    save_plot(draw, "Scheduling Algorithm", "Time", "Scheduling Algorithms — Average Times",
+              "scheduling_times.png", figsize=(9, 6), grid_alpha=0.3, legend=True)
+
+# =====================================================
+# MAIN
+# =====================================================
+
+def main():
+    if not os.path.exists(LOG_PATH):
+        print("⚠️ results.csv not found! Run simulator first.")
+        sys.exit(1)
+    os.makedirs(GRAPHS_DIR, exist_ok=True)
+
+    df = parse_columns(load_results())
+    means = phase_means(df)
+
+    phases = phase_groups(df)
+    lb_df = phases["LoadBalancing"]
+
+    plot_build(phases["Build"], means)
+    plot_lb(lb_df, means)
+    plot_irb(lb_df)
+    plot_rrb_tl(lb_df)
+    plot_iot(lb_df)
+    plot_scheduling(phases["Scheduling"], means)
+
+    print(f"✅ Graphs generated successfully in '{GRAPHS_DIR}/'")
+
+if __name__ == "__main__":
+    main()
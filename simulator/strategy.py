@@ -1,6 +1,65 @@
-from typing import List, Dict
-import random
-import statistics
+from typing import List, Dict, Sequence
+import heapq
+from dataclasses import dataclass
+
+import numpy as np
+
+from simulator._jit import njit, HAVE_NUMBA
+
+__all__ = [
+    "set_seed", "compute_load_metrics", "warm_kernels",
+    "sequential_build", "parallel_build", "cached_build", "slim_image_build",
+    "round_robin_load", "least_connections_load", "random_load",
+    "genetic_algorithm_load", "irb_load", "ServiceCaps", "rrb_load",
+    "iot_lb_load", "tl_lb_load",
+    "fcfs_scheduling", "sjf_scheduling", "srtf_scheduling", "hrrn_scheduling",
+]
+
+# Module-level generator (no global-state lock), reseeded by set_seed; the
+# njit kernels are seeded from it per call
+_rng = np.random.default_rng()
+
+
+def set_seed(seed: int = None) -> None:
+    global _rng
+    _rng = np.random.default_rng(seed)
+
+
+# Random draws inside the kernels. Compiled, np.random.* there uses numba's
+# own generator state, so seeding it never touches NumPy's. Interpreted, the
+# same calls would reseed NumPy's process-global RNG under the caller's feet,
+# so without numba the kernels draw from a private Generator instead
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _kernel_seed(seed):
+        np.random.seed(seed)
+
+    @njit(cache=True)
+    def _kernel_randint(low, high):
+        return np.random.randint(low, high)
+
+    @njit(cache=True)
+    def _kernel_random():
+        return np.random.random()
+
+    @njit(cache=True)
+    def _kernel_multinomial(n, pvals):
+        return np.random.multinomial(n, pvals)
+else:
+    _kernel_rng = np.random.default_rng()
+
+    def _kernel_seed(seed):
+        global _kernel_rng
+        _kernel_rng = np.random.default_rng(seed)
+
+    def _kernel_randint(low, high):
+        return _kernel_rng.integers(low, high)
+
+    def _kernel_random():
+        return _kernel_rng.random()
+
+    def _kernel_multinomial(n, pvals):
+        return _kernel_rng.multinomial(n, pvals)
 
 # =========================================================
 # BUILD STRATEGIES
@@ -56,7 +115,43 @@ def slim_image_build(num_services: int, avg_time: int, slimming_factor: float =
 # COMMON LOAD METRICS (ZERO-SAFE)
 # =========================================================
 
-def compute_load_metrics(distribution: List[int]) -> Dict:
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _load_stats(loads):
+        # Sum, sum of squares, max and min in one pass over the loads, then
+        # the variance centred on the mean in a second. Squares are taken in
+        # float64: in int64 they overflow once a load passes ~3e9
+        n = loads.shape[0]
+        total = loads[0] - loads[0]
+        sum_sq = 0.0
+        mx = loads[0]
+        mn = loads[0]
+        for i in range(n):
+            x = loads[i]
+            total += x
+            sum_sq += np.float64(x) * np.float64(x)
+            if x > mx:
+                mx = x
+            if x < mn:
+                mn = x
+        mean = np.float64(total) / n
+        m2 = 0.0
+        for i in range(n):
+            d = np.float64(loads[i]) - mean
+            m2 += d * d
+        return total, sum_sq, mx, mn, m2 / n
+else:
+    def _load_stats(loads):
+        # Sum of squares as a float64 dot product (no int64 overflow)
+        f = loads.astype(np.float64, copy=False)
+        return loads.sum(), f @ f, loads.max(), loads.min(), f.var()
+
+def compute_load_metrics(distribution: Sequence[int]) -> Dict:
+    # Kernels pass their int64 arrays straight in; the result always carries
+    # a plain list so it stays JSON/CSV friendly
+    loads = np.asarray(distribution)
+    if isinstance(distribution, np.ndarray):
+        distribution = distribution.tolist()
     n = len(distribution)
 
     if n == 0:
@@ -70,19 +165,20 @@ def compute_load_metrics(distribution: List[int]) -> Dict:
             "load_imbalance": 0.0
         }
 
-    total = sum(distribution)
+    as_scalar = int if loads.dtype.kind in "iub" else float
+    total, sum_sq, max_load, min_load, variance = _load_stats(loads)
+    total, max_load, min_load = as_scalar(total), as_scalar(max_load), as_scalar(min_load)
+    # The variance comes centred on the mean: (n*sum_sq - total^2) / n^2
+    # cancels to noise on large, near-uniform loads
+    sum_sq, variance = float(sum_sq), float(variance)
     avg = total / n
-    max_load = max(distribution)
-    min_load = min(distribution)
-    variance = statistics.pvariance(distribution)
-
-    sum_sq = sum(x ** 2 for x in distribution)
 
     # 🔒 ZERO-SAFE FAIRNESS (CRITICAL FIX)
     if total == 0 or sum_sq == 0:
         fairness = 1.0
     else:
-        fairness = (total ** 2) / (n * sum_sq)
+        # Mathematically <= 1; the float sum of squares can round just past it
+        fairness = min(1.0, (total * total) / (n * sum_sq))
 
     return {
         "distribution": distribution,
@@ -100,71 +196,322 @@ def compute_load_metrics(distribution: List[int]) -> Dict:
 # =========================================================
 
 def round_robin_load(requests: int, num_services: int) -> Dict:
-    d = [0] * num_services
-    for i in range(requests):
-        d[i % num_services] += 1
+    # Request i lands on service i % n, so the first `rem` services get one extra
+    requests = max(requests, 0)
+    if num_services <= 0:
+        if requests:
+            raise ValueError("round_robin_load needs at least one service")
+        d = np.zeros(0, dtype=np.int64)
+    else:
+        base, rem = divmod(requests, num_services)
+        d = np.full(num_services, base, dtype=np.int64)
+        d[:rem] += 1
     m = compute_load_metrics(d)
     m["algorithm"] = "Round Robin"
     return m
 
 
-def least_connections_load(requests: int, loads: List[int]) -> Dict:
-    loads = loads[:]
+@njit(cache=True)
+def _least_connections_kernel(loads, requests):
+    # Min-heap of int64 keys `load * n + index`: same pick as
+    # loads.index(min(loads)), lowest index among equals, in O(log n)
+    n = loads.shape[0]
+    heap = [loads[i] * n + i for i in range(n)]
+    heapq.heapify(heap)
     for _ in range(requests):
-        loads[loads.index(min(loads))] += 1
+        key = heap[0]
+        loads[key % n] += 1
+        heapq.heapreplace(heap, key + n)
+    return loads
+
+
+def least_connections_load(requests: int, loads: Sequence[int]) -> Dict:
+    # Always work on a private copy: ndarray slices are views, tuples are immutable
+    loads = np.array(loads, dtype=np.int64)
+    if requests > 0 and loads.shape[0] == 0:
+        raise ValueError("least_connections_load needs at least one service")
+    if requests > 0:
+        _least_connections_kernel(loads, requests)
     m = compute_load_metrics(loads)
     m["algorithm"] = "Least Connections"
     return m
 
 
+def _uniform_counts(requests: int, n: int) -> np.ndarray:
+    # Per-service counts of `requests` uniform picks, drawn in one multinomial
+    # call (equivalent in distribution to bincount over per-request picks)
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    return _rng.multinomial(max(requests, 0), np.full(n, 1.0 / n))
+
+
 def random_load(requests: int, num_services: int) -> Dict:
-    d = [0] * num_services
-    for _ in range(requests):
-        d[random.randint(0, num_services - 1)] += 1
+    if requests > 0 and num_services <= 0:
+        raise ValueError("random_load needs at least one service")
+    d = _uniform_counts(requests, num_services)
     m = compute_load_metrics(d)
     m["algorithm"] = "Random"
     return m
 
 
-def genetic_algorithm_load(requests: int, num_services: int) -> Dict:
-    # Balanced baseline (stable GA surrogate)
-    d = [requests // num_services] * num_services
-    m = compute_load_metrics(d)
+@njit(cache=True, fastmath=True)
+def _ga_fitness(pop, out):
+    # Population variance of every individual (row), written into `out`
+    n_pop, n = pop.shape
+    for p in range(n_pop):
+        s = 0.0
+        sq = 0.0
+        for j in range(n):
+            x = np.float64(pop[p, j])
+            s += x
+            sq += x * x
+        mean = s / n
+        out[p] = sq / n - mean * mean
+
+
+@njit(cache=True)
+def _ga_evolve(pop, requests, generations, mutation_rate, seed):
+    # The whole generation loop runs in one kernel; its generator is seeded
+    # from the module _rng, so set_seed() still reproduces GA runs
+    _kernel_seed(seed)
+    population_size, n = pop.shape
+    fitness = np.empty(population_size)
+    _ga_fitness(pop, fitness)
+    # Every row sums to `requests`, so the variance only needs each row's sum
+    # of squares; a child's is taken once after repair, and a mutation moves a
+    # single unit, which shifts it by an O(1) amount
+    mean = requests / n
+    child_fitness = np.empty(population_size)
+    elite = min(2, population_size)
+    n_parents = max(2, population_size // 2)
+    uniform = np.full(n, 1.0 / n)
+
+    # Rank by index instead of gathering a sorted copy; children go into a
+    # second buffer and the two are swapped after every generation
+    children = np.empty_like(pop)
+    for _ in range(generations):
+        order = np.argsort(fitness, kind="mergesort")
+        best = pop[order[0]]
+        if best.max() - best.min() <= 1:
+            break
+
+        for k in range(elite):
+            children[k] = pop[order[k]]
+            child_fitness[k] = fitness[order[k]]
+        for k in range(elite, population_size):
+            p1 = order[_kernel_randint(0, n_parents)]
+            p2 = order[_kernel_randint(0, n_parents)]
+            cut = _kernel_randint(1, n)
+            for j in range(cut):
+                children[k, j] = pop[p1, j]
+            for j in range(cut, n):
+                children[k, j] = pop[p2, j]
+
+            # Crossover can gain or lose requests; spread the difference over
+            # the services in multinomial batches (O(n) per pass, not per unit),
+            # clipping removals at zero until the total matches
+            diff = requests - children[k].sum()
+            if diff > 0:
+                children[k] += _kernel_multinomial(diff, uniform)
+            while diff < 0:
+                take = _kernel_multinomial(-diff, uniform)
+                for j in range(n):
+                    t = min(take[j], children[k, j])
+                    children[k, j] -= t
+                    diff += t
+
+            sq = 0.0
+            for j in range(n):
+                x = np.float64(children[k, j])
+                sq += x * x
+            if _kernel_random() < mutation_rate:
+                src = _kernel_randint(0, n)
+                dst = _kernel_randint(0, n)
+                if children[k, src] > 0:
+                    # a -> a-1 removes 2a-1 from the sum of squares, then
+                    # b -> b+1 adds 2b+1 (b read after the decrement)
+                    sq -= 2.0 * np.float64(children[k, src]) - 1.0
+                    children[k, src] -= 1
+                    sq += 2.0 * np.float64(children[k, dst]) + 1.0
+                    children[k, dst] += 1
+            child_fitness[k] = sq / n - mean * mean
+        pop, children = children, pop
+        fitness, child_fitness = child_fitness, fitness
+
+    return pop[np.argmin(fitness)].copy()
+
+
+def genetic_algorithm_load(requests: int, num_services: int, generations: int = 50,
+                           population_size: int = 20, mutation_rate: float = 0.2) -> Dict:
+    if num_services <= 1:
+        m = compute_load_metrics([requests] * num_services)
+        m["algorithm"] = "Genetic Algorithm LB"
+        return m
+
+    # One contiguous (population, services) matrix; int32 halves the memory
+    # the kernel streams through whenever the request count fits
+    dtype = np.int32 if requests < 2**31 else np.int64
+    pop = _rng.multinomial(requests, np.full(num_services, 1.0 / num_services),
+                           size=population_size).astype(dtype)
+    best = _ga_evolve(pop, requests, generations, mutation_rate, int(_rng.integers(2**31)))
+    m = compute_load_metrics(best.astype(np.int64))
     m["algorithm"] = "Genetic Algorithm LB"
     return m
 
 
-def irb_load(requests: int, service_caps: List[Dict[str, float]]) -> Dict:
+@dataclass(frozen=True)
+class ServiceCaps:
+    """Per-instance IRB capacities and costs as parallel float32 arrays."""
+    cpu_cap: np.ndarray
+    mem_cap: np.ndarray
+    cpu_cost: np.ndarray
+    mem_cost: np.ndarray
+
+    _KEYS = ("cpu_capacity", "mem_capacity", "cpu_cost", "mem_cost")
+
+    @classmethod
+    def from_dicts(cls, caps: List[Dict[str, float]]) -> "ServiceCaps":
+        # One flat pass over the dicts into a (4, n) buffer; each row is then a
+        # contiguous column. Capacities are required, costs default to 1.
+        n = len(caps)
+        flat = np.fromiter(
+            (c[k] if k in cls._KEYS[:2] else c.get(k, 1.0)
+             for k in cls._KEYS for c in caps),
+            dtype=np.float32, count=4 * n)
+        return cls(*flat.reshape(4, n))
+
+    @classmethod
+    def full(cls, n: int, cpu_cap=10, mem_cap=8, cpu_cost=1, mem_cost=1) -> "ServiceCaps":
+        return cls(*(np.full(n, v, dtype=np.float32) for v in (cpu_cap, mem_cap, cpu_cost, mem_cost)))
+
+    def __len__(self) -> int:
+        return self.cpu_cap.shape[0]
+
+    def to_dicts(self) -> List[Dict[str, float]]:
+        cols = [a.tolist() for a in (self.cpu_cap, self.mem_cap, self.cpu_cost, self.mem_cost)]
+        return [dict(zip(self._KEYS, row)) for row in zip(*cols)]
+
+
+@njit(cache=True)
+def _irb_fill(d, unit, left):
+    # Place `left` more requests greedily from a min-heap of
+    # ((load + 1) * unit, index): the same pick as argmin over the scores,
+    # lowest index among equals, in O(log n) instead of O(n)
+    n = d.shape[0]
+    heap = [((d[i] + 1) * unit[i], i) for i in range(n)]
+    heapq.heapify(heap)
+    for _ in range(left):
+        i = heap[0][1]
+        d[i] += 1
+        heapq.heapreplace(heap, ((d[i] + 1) * unit[i], i))
+
+
+def irb_load(requests: int, service_caps) -> Dict:
+    # Each request goes to the instance whose resource cost after taking it,
+    # (load + 1) * (cpu_cost / cpu_cap + mem_cost / mem_cap), is lowest
+    if not isinstance(service_caps, ServiceCaps):
+        service_caps = ServiceCaps.from_dicts(service_caps)
     n = len(service_caps)
-    d = [0] * n
-    for _ in range(requests):
-        d[random.randint(0, n - 1)] += 1
+    d = np.zeros(n, dtype=np.int64)
+    if n:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            unit = (service_caps.cpu_cost / service_caps.cpu_cap
+                    + service_caps.mem_cost / service_caps.mem_cap).astype(np.float64)
+        # 0/0 (no cost on no capacity) is undefined; never prefer such an instance
+        unit[np.isnan(unit)] = np.inf
+        left = requests
+        if left > 0 and np.all(np.isfinite(unit)) and np.all(unit > 0):
+            # Greedy placement takes the `requests` smallest (k * unit[i], i)
+            # pairs, so fill every pair below the water level in one vector
+            # step; the pairs left over (at most ~n) go through the greedy heap
+            level = left / np.sum(1.0 / unit) * (1.0 - 1e-9)
+            d = np.maximum(np.ceil(level / unit).astype(np.int64) - 1, 0)
+            d -= (d * unit >= level) & (d > 0)
+            d += (d + 1) * unit < level
+            left -= int(d.sum())
+        if left > 0:
+            _irb_fill(d, unit, left)
     m = compute_load_metrics(d)
     m["algorithm"] = "IRB LB"
+    m["service_capacities_summary"] = service_caps.to_dicts()
     return m
 
 
-def rrb_load(requests: int, num_services: int) -> Dict:
-    d = [requests // num_services] * num_services
+@njit(cache=True)
+def _rrb_kernel(requests, n, epsilon, lr, seed):
+    # Epsilon-greedy routing; the reward for an instance falls with its load.
+    # Past a few dozen instances the greedy pick comes from a max-heap of
+    # (-Q, index) instead of an O(n) argmax: only the routed instance's Q
+    # changes, so it gets a fresh entry, and entries whose value no longer
+    # matches Q are dropped when they surface. Ties go to the lowest index.
+    _kernel_seed(seed)
+    Q = np.ones(n)
+    dist = np.zeros(n, np.int64)
+    use_heap = n > 64
+    heap = [(-Q[j], j) for j in range(n if use_heap else 0)]
+    heapq.heapify(heap)
+    for _ in range(requests):
+        if _kernel_random() < epsilon:
+            i = _kernel_randint(0, n)
+        elif use_heap:
+            while Q[heap[0][1]] != -heap[0][0]:
+                heapq.heappop(heap)
+            i = heap[0][1]
+        else:
+            i = np.argmax(Q)
+        dist[i] += 1
+        Q[i] += lr * (1.0 / (1.0 + dist[i]) - Q[i])
+        if use_heap:
+            if heap[0][1] == i:
+                heapq.heapreplace(heap, (-Q[i], i))
+            else:
+                heapq.heappush(heap, (-Q[i], i))
+    return dist, Q
+
+
+def rrb_load(requests: int, num_services: int, epsilon: float = 0.1,
+             learning_rate: float = 0.2) -> Dict:
+    if requests > 0 and num_services <= 0:
+        raise ValueError("rrb_load needs at least one service")
+    d, Q = _rrb_kernel(max(requests, 0), max(num_services, 0), float(epsilon), float(learning_rate),
+                       int(_rng.integers(2**31)))
     m = compute_load_metrics(d)
     m["algorithm"] = "RRB LB"
+    m["Q_values"] = Q.tolist()
     return m
 
 
+# Signal keys and the values assumed when an instance does not report one
+_IOT_SIGNALS = (("latency", 50.0), ("network_delay", 20.0), ("cpu_temp", 65.0))
+
+
 def iot_lb_load(requests: int, iot_signals: List[Dict[str, float]]) -> Dict:
-    d = [0] * len(iot_signals)
-    for _ in range(requests):
-        d[random.randint(0, len(d) - 1)] += 1
+    n = len(iot_signals)
+    if requests > 0 and n == 0:
+        raise ValueError("iot_lb_load needs at least one service")
+    if n == 0:
+        d = []
+    else:
+        # Scores depend only on the signals, so they are computed once per
+        # call; requests are then split in proportion with one multinomial draw
+        sig = np.array([[s.get(k, v) for k, v in _IOT_SIGNALS] for s in iot_signals],
+                       dtype=np.float64)
+        score = (1.0 / (sig + 1e-6)).sum(axis=1)
+        d = _rng.multinomial(max(requests, 0), score / score.sum())
     m = compute_load_metrics(d)
     m["algorithm"] = "IoT-based CI/CD LB"
     return m
 
 
 def tl_lb_load(requests: int, num_services: int, pretrained_Q: List[float]) -> Dict:
+    # The transferred Q-values are not updated while routing, so every request
+    # picks the same (first) argmax and the loop collapses to one assignment
     d = [0] * num_services
-    for _ in range(requests):
-        idx = pretrained_Q[:num_services].index(max(pretrained_Q[:num_services]))
-        d[idx] += 1
+    if requests > 0:
+        q = pretrained_Q[:num_services]
+        if not len(q):
+            raise ValueError("tl_lb_load needs pretrained Q-values")
+        d[int(np.argmax(q))] = requests
     m = compute_load_metrics(d)
     m["algorithm"] = "TL-based CI/CD LB"
     return m
@@ -174,30 +521,260 @@ def tl_lb_load(requests: int, num_services: int, pretrained_Q: List[float]) -> D
 # SCHEDULING ALGORITHMS
 # =========================================================
 
-def fcfs_scheduling(arrival: List[int], burst: List[int]) -> Dict:
-    n = len(burst)
-    ct, tat, wt = [0]*n, [0]*n, [0]*n
+# Kernels take int64 arrival/burst arrays plus the arrival order (stable
+# argsort) and fill the completion time and first-start time of every job.
+# Ready queues are heaps of int64 keys `priority * n + rank`, where rank is
+# the job's position in arrival order, so ties go to the earlier arrival.
+
+def _fcfs_kernel(arrival, burst, order, ct, st):
+    # FCFS has a closed form: in arrival order the k-th job finishes at
+    # done[k] + max(0, max_{j<=k}(arrival[j] - done[j-1])), where done is the
+    # running burst total, so a cumsum and a running max replace the loop
+    a = arrival[order]
+    b = burst[order]
+    done = np.cumsum(b)
+    end = done + np.maximum(np.maximum.accumulate(a - (done - b)), 0)
+    ct[order] = end
+    st[order] = end - b
+
+
+@njit(cache=True)
+def _sjf_kernel(arrival, burst, order, ct, st):
+    n = order.shape[0]
+    heap = [np.int64(0)]
+    heap.pop()
+    time = 0
+    k = 0
+    for _ in range(n):
+        if len(heap) == 0 and arrival[order[k]] > time:
+            time = arrival[order[k]]
+        while k < n and arrival[order[k]] <= time:
+            heapq.heappush(heap, burst[order[k]] * n + k)
+            k += 1
+        i = order[heapq.heappop(heap) % n]
+        st[i] = time
+        time += burst[i]
+        ct[i] = time
+
+
+@njit(cache=True)
+def _srtf_kernel(arrival, burst, order, ct, st):
+    # Event driven: the shortest remaining job runs until it finishes or the
+    # next arrival; after an arrival one heappushpop either keeps it running
+    # or swaps in a shorter job, with no pop/push round trip when it stays
+    n = order.shape[0]
+    remaining = burst.copy()
+    st[:] = -1
+    heap = [np.int64(0)]
+    heap.pop()
     time = 0
-    for i in range(n):
-        time = max(time, arrival[i])
-        ct[i] = time + burst[i]
-        tat[i] = ct[i] - arrival[i]
-        wt[i] = tat[i] - burst[i]
-        time = ct[i]
+    k = 0
+    done = 0
+    rank = -1
+    while done < n:
+        if rank < 0:
+            if len(heap) == 0 and arrival[order[k]] > time:
+                time = arrival[order[k]]
+            while k < n and arrival[order[k]] <= time:
+                heapq.heappush(heap, remaining[order[k]] * n + k)
+                k += 1
+            rank = heapq.heappop(heap) % n
+        i = order[rank]
+        if st[i] < 0:
+            st[i] = time
+        run = remaining[i]
+        if k < n and arrival[order[k]] - time < run:
+            run = arrival[order[k]] - time
+        time += run
+        remaining[i] -= run
+        if remaining[i] == 0:
+            ct[i] = time
+            done += 1
+            rank = -1
+            continue
+        while k < n and arrival[order[k]] <= time:
+            heapq.heappush(heap, remaining[order[k]] * n + k)
+            k += 1
+        rank = heapq.heappushpop(heap, remaining[i] * n + rank) % n
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _hrrn_kernel(arrival, burst, order, ct, st):
+        # Ready jobs are kept in arrival order, so the first highest response
+        # ratio found is also the earliest arrival among equals. Ratios
+        # (wait + burst) / burst are compared exactly by cross-multiplying;
+        # a zero burst counts as an infinite ratio.
+        n = order.shape[0]
+        ready = np.empty(n, dtype=np.int64)
+        m = 0
+        time = 0
+        k = 0
+        for _ in range(n):
+            if m == 0 and arrival[order[k]] > time:
+                time = arrival[order[k]]
+            while k < n and arrival[order[k]] <= time:
+                ready[m] = order[k]
+                m += 1
+                k += 1
+            best = 0
+            num = time - arrival[ready[0]] + burst[ready[0]]
+            den = burst[ready[0]]
+            for j in range(1, m):
+                if den == 0:
+                    break
+                i = ready[j]
+                if burst[i] == 0 or (time - arrival[i] + burst[i]) * den > num * burst[i]:
+                    best = j
+                    num = time - arrival[i] + burst[i]
+                    den = burst[i]
+            i = ready[best]
+            ready[best:m - 1] = ready[best + 1:m]
+            m -= 1
+            st[i] = time
+            time += burst[i]
+            ct[i] = time
+else:
+    def _hrrn_kernel(arrival, burst, order, ct, st):
+        # Interpreted, the per-job scans above are O(n^2) Python steps; here
+        # each pick is a few whole-slice NumPy ops over the ready jobs. Float
+        # ratios find the candidates and near-ties are settled exactly by
+        # cross-multiplying, so the picks match the compiled kernel
+        n = order.shape[0]
+        sorted_arrival = arrival[order]
+        ready = np.empty(n, dtype=np.int64)
+        m = 0
+        time = 0
+        k = 0
+        for _ in range(n):
+            if m == 0 and sorted_arrival[k] > time:
+                time = int(sorted_arrival[k])
+            k_next = int(np.searchsorted(sorted_arrival, time, side="right"))
+            ready[m:m + k_next - k] = order[k:k_next]
+            m += k_next - k
+            k = k_next
+
+            jobs = ready[:m]
+            b = burst[jobs]
+            zero = np.flatnonzero(b == 0)
+            if zero.size:
+                best = int(zero[0])
+            else:
+                w = time - arrival[jobs] + b
+                r = w / b
+                top = np.flatnonzero(r >= r.max() * (1 - 1e-12))
+                best = int(top[0])
+                num, den = int(w[best]), int(b[best])
+                for j in top[1:].tolist():
+                    if int(w[j]) * den > num * int(b[j]):
+                        best, num, den = j, int(w[j]), int(b[j])
+            i = ready[best]
+            ready[best:m - 1] = ready[best + 1:m]
+            m -= 1
+            st[i] = time
+            time += int(burst[i])
+            ct[i] = time
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _job_times(arrival, burst, ct, st, tat, wt, rt):
+        # Turnaround, waiting and response times plus their totals in one pass
+        sum_tat = 0
+        sum_wt = 0
+        sum_rt = 0
+        for i in range(ct.shape[0]):
+            tat[i] = ct[i] - arrival[i]
+            wt[i] = tat[i] - burst[i]
+            rt[i] = st[i] - arrival[i]
+            sum_tat += tat[i]
+            sum_wt += wt[i]
+            sum_rt += rt[i]
+        return sum_tat, sum_wt, sum_rt
+else:
+    def _job_times(arrival, burst, ct, st, tat, wt, rt):
+        # Interpreted, the per-job loop is far slower than whole-array ops
+        np.subtract(ct, arrival, out=tat)
+        np.subtract(tat, burst, out=wt)
+        np.subtract(st, arrival, out=rt)
+        return tat.sum(), wt.sum(), rt.sum()
+
+
+def _prep(arrival: Sequence[int], burst: Sequence[int]):
+    # One conversion at the API boundary; int64 C-contiguous arrays (the
+    # kernels' native type) pass through without a copy
+    at = np.ascontiguousarray(arrival, dtype=np.int64)
+    bt = np.ascontiguousarray(burst, dtype=np.int64)
+    if at.ndim != 1 or at.shape != bt.shape:
+        raise ValueError("arrival and burst times must be 1-D and of equal length")
+    return at, bt
+
+
+def _schedule(kernel, arrival: Sequence[int], burst: Sequence[int]) -> Dict:
+    at, bt = _prep(arrival, burst)
+    n = bt.shape[0]
+    if n == 0:
+        return {
+            "completion_times": [], "turnaround_times": [],
+            "waiting_times": [], "response_times": [],
+            "avg_waiting": 0.0, "avg_turnaround": 0.0, "avg_response": 0.0,
+        }
+
+    ct = np.empty(n, dtype=np.int64)
+    st = np.empty(n, dtype=np.int64)
+    # Workloads usually arrive already in arrival order; a linear check
+    # replaces the O(n log n) stable argsort, which would return arange(n)
+    if n < 2 or (at[1:] >= at[:-1]).all():
+        order = np.arange(n)
+    else:
+        order = np.argsort(at, kind="stable")
+    kernel(at, bt, order, ct, st)
+
+    tat = np.empty(n, dtype=np.int64)
+    wt = np.empty(n, dtype=np.int64)
+    rt = np.empty(n, dtype=np.int64)
+    sum_tat, sum_wt, sum_rt = _job_times(at, bt, ct, st, tat, wt, rt)
     return {
-        "avg_waiting": sum(wt)/n,
-        "avg_turnaround": sum(tat)/n,
-        "avg_response": sum(wt)/n
+        "completion_times": ct.tolist(),
+        "turnaround_times": tat.tolist(),
+        "waiting_times": wt.tolist(),
+        "response_times": rt.tolist(),
+        "avg_waiting": float(sum_wt / n),
+        "avg_turnaround": float(sum_tat / n),
+        "avg_response": float(sum_rt / n),
     }
 
 
-def sjf_scheduling(arrival: List[int], burst: List[int]) -> Dict:
-    return fcfs_scheduling(arrival, sorted(burst))
+def fcfs_scheduling(arrival: Sequence[int], burst: Sequence[int]) -> Dict:
+    return _schedule(_fcfs_kernel, arrival, burst)
+
+
+def sjf_scheduling(arrival: Sequence[int], burst: Sequence[int]) -> Dict:
+    return _schedule(_sjf_kernel, arrival, burst)
 
 
-def srtf_scheduling(arrival: List[int], burst: List[int]) -> Dict:
-    return fcfs_scheduling(arrival, burst)
+def srtf_scheduling(arrival: Sequence[int], burst: Sequence[int]) -> Dict:
+    return _schedule(_srtf_kernel, arrival, burst)
 
 
-def hrrn_scheduling(arrival: List[int], burst: List[int]) -> Dict:
-    return fcfs_scheduling(arrival, burst)
+def hrrn_scheduling(arrival: Sequence[int], burst: Sequence[int]) -> Dict:
+    return _schedule(_hrrn_kernel, arrival, burst)
+
+
+# =========================================================
+# JIT WARM-UP
+# =========================================================
+
+def warm_kernels() -> None:
+    # Call every njit kernel once on tiny inputs so numba compiles them (or
+    # loads them from its on-disk cache) ahead of the first real run.
+    _ga_fitness(np.zeros((2, 2), dtype=np.int64), np.empty(2))
+    _ga_fitness(np.zeros((2, 2), dtype=np.int32), np.empty(2))
+    _ga_evolve(np.ones((3, 2), dtype=np.int32), 2, 1, 0.5, 0)
+    _ga_evolve(np.ones((3, 2), dtype=np.int64), 2, 1, 0.5, 0)
+    _load_stats(np.zeros(2, dtype=np.int64))
+    _rrb_kernel(2, 2, 0.1, 0.2, 0)
+    _least_connections_kernel(np.zeros(2, dtype=np.int64), 1)
+    _irb_fill(np.zeros(2, dtype=np.int64), np.ones(2), 1)
+    for kernel in (_sjf_kernel, _srtf_kernel, _hrrn_kernel):
+        _schedule(kernel, [0, 1], [2, 1])
@@ -1,9 +1,15 @@
+import atexit
 import random
-import statistics
 import csv
+import functools
+import json
 import os
 from typing import List, Dict, Optional, Sequence, Any
 
+import numpy as np
+
+from simulator._jit import njit, HAVE_NUMBA
+
 # ============================================================
 # GLOBAL CSV HEADERS (CONSISTENT ACROSS PROJECT)
 # ============================================================
@@ -32,49 +38,248 @@ DEFAULT_CSV_HEADERS = [
 # BASIC RANDOM & STATISTICS
 # ============================================================
 
+_randint = random.randint
+_RNG = None
+
+
+def _rng(seed: int = None) -> np.random.Generator:
+    global _RNG
+    if seed is not None:
+        return np.random.default_rng(seed)
+    if _RNG is None:
+        _RNG = np.random.default_rng()
+    return _RNG
+
+
 def random_delay(base: int, variation: int = 2, allow_negative: bool = False) -> int:
-    delta = random.randint(-variation, variation) if allow_negative else random.randint(0, variation)
-    return max(0, base + delta)
+    v = base + (_randint(-variation, variation) if allow_negative else _randint(0, variation))
+    return v if v > 0 else 0
+
+
+def random_delays(base: int,
+                  count: int,
+                  variation: int = 2,
+                  allow_negative: bool = False,
+                  seed: int = None) -> np.ndarray:
+    """
+    `count` draws of random_delay at once, as an int64 array.
+    """
+    low = -variation if allow_negative else 0
+    delays = _rng(seed).integers(low, variation + 1, size=count, dtype=np.int64)
+    delays += base
+    return np.maximum(delays, 0, out=delays)
+
+
+def _as_array(distribution: Sequence[float]) -> np.ndarray:
+    # No copy when the caller already holds float64 values in an ndarray or
+    # another buffer such as array.array("d"). The helpers sum
+    # with NumPy's pairwise summation, whose rounding error grows with
+    # log(n) rather than n as in the left fold of the builtin sum()
+    return np.asarray(distribution, dtype=np.float64)
+
+
+# Reporting code tends to ask for several metrics of the same short list;
+# those calls are served from a small LRU keyed on the distribution's values.
+# Arrays and longer lists skip it: hashing the key costs about as much as the
+# reduction, and the keys would stay alive for the life of the process.
+_METRIC_CACHE_MAX_LEN = 256
+_METRIC_CACHE_SIZE = 64
+_MEMOIZED_METRICS: List[Any] = []
+
+
+def _memoize_distribution(fn):
+    cached = functools.lru_cache(maxsize=_METRIC_CACHE_SIZE)(fn)
+
+    @functools.wraps(fn)
+    def wrapper(distribution):
+        if isinstance(distribution, (list, tuple)) and len(distribution) <= _METRIC_CACHE_MAX_LEN:
+            return cached(tuple(distribution))
+        return fn(distribution)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    _MEMOIZED_METRICS.append(wrapper)
+    return wrapper
 
 
+def clear_metric_cache() -> None:
+    for fn in _MEMOIZED_METRICS:
+        fn.cache_clear()
+
+
+@_memoize_distribution
 def average_load(distribution: Sequence[float]) -> float:
-    return sum(distribution) / len(distribution) if distribution else 0.0
+    arr = _as_array(distribution)
+    return float(arr.mean()) if arr.size else 0.0
 
 
 def max_load(distribution: Sequence[float]) -> float:
-    return max(distribution) if distribution else 0.0
+    arr = _as_array(distribution)
+    return float(arr.max()) if arr.size else 0.0
 
 
 def min_load(distribution: Sequence[float]) -> float:
-    return min(distribution) if distribution else 0.0
+    arr = _as_array(distribution)
+    return float(arr.min()) if arr.size else 0.0
 
 
+@_memoize_distribution
 def variance_load(distribution: Sequence[float]) -> float:
-    return statistics.pvariance(distribution) if len(distribution) > 1 else 0.0
+    # Population variance, two-pass in C rather than statistics' Fractions
+    arr = _as_array(distribution)
+    return float(arr.var()) if arr.size > 1 else 0.0
 
 
 def stdev_load(distribution: Sequence[float]) -> float:
-    return statistics.pstdev(distribution) if len(distribution) > 1 else 0.0
+    return variance_load(distribution) ** 0.5
 
 
+@_memoize_distribution
 def fairness_index(distribution: Sequence[float]) -> float:
     """
     Jain's Fairness Index
     """
-    if not distribution:
-        return 1.0
-    total = sum(distribution)
+    arr = _as_array(distribution)
+    total = arr.sum()
     if total == 0:
         return 1.0
-    return (total ** 2) / (len(distribution) * sum(x ** 2 for x in distribution))
+    return float(total * total / (arr.size * np.dot(arr, arr)))
 
 
+@_memoize_distribution
 def load_imbalance(distribution: Sequence[float]) -> float:
     """
     (max_load / avg_load) - 1
     """
-    avg = average_load(distribution)
-    return (max_load(distribution) / avg - 1.0) if avg > 0 else 0.0
+    arr = _as_array(distribution)
+    avg = arr.mean() if arr.size else 0.0
+    return float(arr.max() / avg - 1.0) if avg > 0 else 0.0
+
+
+def _distribution_stats(arr: np.ndarray):
+    # Sum, sum of squares, min, max and variance of a non-empty array. The
+    # variance is centred on the mean (as in variance_load) rather than taken
+    # from E[x^2] - E[x]^2, which cancels to nothing on large, even loads
+    return arr.sum(), np.dot(arr, arr), arr.min(), arr.max(), arr.var()
+
+
+@njit(cache=True)
+def _distribution_stats_kernel(arr):
+    # The same values in two fused passes, the second for the centred
+    # variance. Separate NumPy reductions cost more in dispatch than in
+    # arithmetic on short arrays; past ~10k values their vectorised loops
+    # win, so this is only used below _FUSED_STATS_MAX_LEN
+    n = arr.shape[0]
+    s = 0.0
+    sq = 0.0
+    mn = arr[0]
+    mx = arr[0]
+    for i in range(n):
+        x = arr[i]
+        s += x
+        sq += x * x
+        if x < mn:
+            mn = x
+        if x > mx:
+            mx = x
+    mean = s / n
+    m2 = 0.0
+    for i in range(n):
+        d = arr[i] - mean
+        m2 += d * d
+    return s, sq, mn, mx, m2 / n
+
+
+_FUSED_STATS_MAX_LEN = 8192 if HAVE_NUMBA else 0
+
+
+def compute_distribution_metrics(distribution: Sequence[float]) -> Dict[str, float]:
+    """
+    All load metrics of one distribution from one set of reductions,
+    keyed like the CSV columns.
+    """
+    arr = _as_array(distribution)
+    n = arr.size
+    if n == 0:
+        return {"avg_load": 0.0, "max_load": 0.0, "min_load": 0.0, "variance": 0.0,
+                "fairness_index": 1.0, "load_imbalance": 0.0}
+
+    stats = _distribution_stats_kernel if n < _FUSED_STATS_MAX_LEN else _distribution_stats
+    total, sum_sq, mn, mx, var = map(float, stats(arr))
+    avg = total / n
+    return {
+        "avg_load": avg,
+        "max_load": mx,
+        "min_load": mn,
+        "variance": var if n > 1 else 0.0,
+        "fairness_index": 1.0 if total == 0 else total * total / (n * sum_sq),
+        "load_imbalance": mx / avg - 1.0 if avg > 0 else 0.0,
+    }
+
+
+class DistributionAggregator:
+    """
+    Running load metrics for samples that arrive one at a time, without
+    keeping them. Variance uses Welford's update, so it stays stable where
+    E[x^2] - E[x]^2 would cancel.
+    """
+
+    __slots__ = ("n", "mean", "m2", "total", "sum_sq", "min", "max")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.sum_sq = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+        self.total += x
+        self.sum_sq += x * x
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def extend(self, values: Sequence[float]) -> None:
+        # Folds a whole batch in with Chan's merge of (n, mean, m2)
+        arr = _as_array(values)
+        if arr.size == 0:
+            return
+        n_b = arr.size
+        mean_b = float(arr.mean())
+        dev = arr - mean_b
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.m2 += float(np.dot(dev, dev)) + delta * delta * self.n * n_b / n
+        self.mean += delta * n_b / n
+        self.n = n
+        self.total += float(arr.sum())
+        self.sum_sq += float(np.dot(arr, arr))
+        self.min = min(self.min, float(arr.min()))
+        self.max = max(self.max, float(arr.max()))
+
+    def variance(self) -> float:
+        return self.m2 / self.n if self.n > 1 else 0.0
+
+    def metrics(self) -> Dict[str, float]:
+        # Same keys and empty-input values as compute_distribution_metrics
+        if self.n == 0:
+            return compute_distribution_metrics([])
+        return {
+            "avg_load": self.mean,
+            "max_load": self.max,
+            "min_load": self.min,
+            "variance": self.variance(),
+            "fairness_index": 1.0 if self.total == 0 else self.total * self.total / (self.n * self.sum_sq),
+            "load_imbalance": self.max / self.mean - 1.0 if self.mean > 0 else 0.0,
+        }
 
 
 def speedup(sequential_time: float, parallel_time: float) -> float:
@@ -97,33 +302,72 @@ def resource_score(cpu_capacity: float,
                    used_mem: float = 0.0,
                    cpu_weight: float = 1.0,
                    mem_weight: float = 1.0) -> float:
-    cpu_avail = max(0.0, cpu_capacity - used_cpu)
-    mem_avail = max(0.0, mem_capacity - used_mem)
-    return cpu_weight * cpu_avail + mem_weight * mem_avail
+    cpu_avail = cpu_capacity - used_cpu
+    mem_avail = mem_capacity - used_mem
+    return (cpu_weight * (cpu_avail if cpu_avail > 0 else 0.0) +
+            mem_weight * (mem_avail if mem_avail > 0 else 0.0))
 
 
 # ============================================================
 # REINFORCEMENT & TRANSFER LEARNING HELPERS
 # ============================================================
 
+@njit(cache=True)
+def _rl_update_kernel(Q, idx, reward, learning_rate):
+    q = Q[idx]
+    Q[idx] = q + learning_rate * (reward - q)
+    return Q[idx]
+
+
+@njit(cache=True)
+def _rl_update_batch_kernel(Q, idxs, rewards, learning_rate):
+    # Applied in order, so an arm that appears twice sees its first update
+    for k in range(idxs.shape[0]):
+        i = idxs[k]
+        Q[i] += learning_rate * (rewards[k] - Q[i])
+
+
 def rl_update(Q: List[float],
               idx: int,
               reward: float,
               learning_rate: float = 0.2) -> float:
+    # float64 arrays are updated in place by the compiled kernel, which does
+    # not bounds-check, so the index is checked here
+    if isinstance(Q, np.ndarray) and Q.dtype == np.float64:
+        if not -Q.shape[0] <= idx < Q.shape[0]:
+            raise IndexError("Q index out of range")
+        return _rl_update_kernel(Q, idx, reward, learning_rate)
     Q[idx] = Q[idx] + learning_rate * (reward - Q[idx])
     return Q[idx]
 
 
+def rl_update_batch(Q: np.ndarray,
+                    idxs: Sequence[int],
+                    rewards: Sequence[float],
+                    learning_rate: float = 0.2) -> np.ndarray:
+    """
+    Applies rl_update for every (idx, reward) pair, in order, to a float64 Q.
+    """
+    idxs = np.asarray(idxs, dtype=np.int64)
+    rewards = np.asarray(rewards, dtype=np.float64)
+    if idxs.shape != rewards.shape:
+        raise ValueError("idxs and rewards must have the same length")
+    if idxs.size and (idxs.min() < -Q.shape[0] or idxs.max() >= Q.shape[0]):
+        raise IndexError("Q index out of range")
+    _rl_update_batch_kernel(Q, idxs, rewards, learning_rate)
+    return Q
+
+
 def init_transfer_q(source_q: Sequence[float],
                     target_size: int,
                     transfer_ratio: float = 0.7) -> List[float]:
     """
     Transfer learning initialization for TL-based LB.
     """
-    Q = [1.0] * target_size
-    for i in range(min(len(source_q), target_size)):
-        Q[i] = transfer_ratio * source_q[i] + (1 - transfer_ratio)
-    return Q
+    Q = np.ones(target_size)
+    k = min(len(source_q), target_size)
+    Q[:k] = transfer_ratio * _as_array(source_q[:k]) + (1 - transfer_ratio)
+    return Q.tolist()
 
 
 def transfer_effectiveness(source_q: Sequence[float],
@@ -131,11 +375,11 @@ def transfer_effectiveness(source_q: Sequence[float],
     """
     Measures how close the learned policy remains to the transferred knowledge.
     """
-    if not source_q or not final_q:
-        return 0.0
     n = min(len(source_q), len(final_q))
-    diff = sum(abs(source_q[i] - final_q[i]) for i in range(n))
-    return 1.0 / (1.0 + diff)
+    if n == 0:
+        return 0.0
+    diff = np.abs(_as_array(source_q[:n]) - _as_array(final_q[:n])).sum()
+    return float(1.0 / (1.0 + diff))
 
 
 # ============================================================
@@ -164,54 +408,207 @@ def iot_load_score(cpu_usage: float,
     )
 
 
+def iot_load_score_batch(features: np.ndarray,
+                         w_cpu: float = 0.4,
+                         w_latency: float = 0.4,
+                         w_queue: float = 0.2) -> np.ndarray:
+    """
+    iot_load_score for every node at once; `features` has one
+    (cpu_usage, latency, queue_depth) row per node.
+    """
+    features = _as_array(features)
+    if features.ndim != 2 or features.shape[1] != 3:
+        raise ValueError("features must have shape (nodes, 3)")
+    return features @ np.array([w_cpu, w_latency, w_queue])
+
+
+def select_node_p2c(scores: Sequence[float], k: int = 2, seed: int = None) -> int:
+    """
+    Power-of-k-choices selection: the lowest-scoring of k nodes drawn at
+    random, instead of a scan over all of them. Re-scoring by current load
+    after each pick keeps the fullest node within O(log log n / log k) of
+    the average.
+    """
+    scores = _as_array(scores)
+    if scores.size == 0:
+        raise ValueError("no nodes to choose from")
+    # Distinct candidates: with replacement a node can be compared with itself
+    idxs = _rng(seed).choice(scores.size, size=min(k, scores.size), replace=False)
+    return int(idxs[np.argmin(scores[idxs])])
+
+
+def select_node_p2c_by(n: int, score_fn, k: int = 2, seed: int = None) -> int:
+    # Same choice with scores computed on demand, for only the k candidates
+    if n <= 0:
+        raise ValueError("no nodes to choose from")
+    return min(_rng(seed).choice(n, size=min(k, n), replace=False).tolist(), key=score_fn)
+
+
 def aggregate_iot_signals(signals: Dict[str, float]) -> float:
-    return sum(signals.values()) / len(signals) if signals else 0.0
+    if not signals:
+        return 0.0
+    return float(np.fromiter(signals.values(), np.float64, len(signals)).mean())
 
 
 # ============================================================
 # CSV LOGGING (SAFE & EXTENSIBLE)
 # ============================================================
 
+def _expand_csv_headers(filename: str, missing: Sequence[str]) -> List[str]:
+    # Rewrite the file once with the new columns appended to its header. New
+    # columns only ever go on the end, so rows are streamed through a temp
+    # file and padded with blank cells instead of being held in memory
+    tmp = filename + ".tmp"
+    with open(filename, "r", newline="") as src, open(tmp, "w", newline="") as dst:
+        reader = csv.reader(src)
+        existing = next(reader, None) or []
+        present = set(existing)
+        new_headers = existing + [k for k in dict.fromkeys(missing) if k not in present]
+        width = len(new_headers)
+        writer = csv.writer(dst)
+        writer.writerow(new_headers)
+        for r in reader:
+            writer.writerow(r + [""] * (width - len(r)))
+    os.replace(tmp, filename)
+    return new_headers
+
+
+class ResultsCSVWriter:
+    """
+    Keeps one results CSV open for repeated writes.
+    The header is written once for a new file; an existing file keeps its own.
+    Rows are pushed to disk every `flush_rows` writes, on flush() and on close.
+
+    Fields outside the header normally add columns, which rewrites the file.
+    With `extras_column` they are stored in that column as one JSON object
+    instead, so the file is never rewritten for them.
+    """
+
+    def __init__(self,
+                 filename: str = "logs/results.csv",
+                 headers: Optional[Sequence[str]] = None,
+                 buffering: int = 1 << 16,
+                 flush_rows: int = 256,
+                 extras_column: Optional[str] = None) -> None:
+        if not headers:
+            headers = list(DEFAULT_CSV_HEADERS)
+        elif headers[0] != "phase":
+            headers = ["phase"] + [h for h in headers if h != "phase"]
+        else:
+            headers = list(headers)
+        if extras_column and extras_column not in headers:
+            headers.append(extras_column)
+
+        self.filename = filename
+        self.buffering = buffering
+        self.flush_rows = flush_rows
+        self.extras_column = extras_column
+        self._pending = 0
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        self._has_rows = os.path.exists(filename) and os.path.getsize(filename) > 0
+        if self._has_rows:
+            with open(filename, "r", newline="") as f:
+                headers = next(csv.reader(f), None) or headers
+        self._open(headers)
+        if not self._has_rows:
+            self._writer.writerow(headers)
+
+    def _open(self, headers: List[str]) -> None:
+        self.headers = headers
+        self._index = {h: i for i, h in enumerate(headers)}
+        self._fh = open(self.filename, "a", newline="", buffering=self.buffering)
+        self._writer = csv.writer(self._fh)
+
+    def write(self, phase: str, result: Dict[str, Any]) -> None:
+        index = self._index
+        if index.keys() >= result.keys():
+            # Every field has a column: a straight positional fill
+            row = [""] * len(self.headers)
+            row[0] = phase
+            for k, v in result.items():
+                # Nested values are stored as JSON so plot_results can json.loads them
+                row[index[k]] = json.dumps(v) if isinstance(v, (list, dict)) else v
+        else:
+            row = self._row_with_extra(phase, result)
+        self._writer.writerow(row)
+        self._has_rows = True
+        self._pending += 1
+        if self.flush_rows and self._pending >= self.flush_rows:
+            self.flush()
+
+    def _row_with_extra(self, phase: str, result: Dict[str, Any]) -> List[Any]:
+        extra = [k for k in result if k not in self._index]
+        if self.extras_column:
+            # An existing file may predate the extras column: add it once
+            if self.extras_column not in self._index:
+                self._expand([self.extras_column])
+        elif self._has_rows:
+            # Columns for new fields are only added once the file holds rows
+            self._expand(extra)
+            extra = []
+
+        row = [""] * len(self.headers)
+        row[0] = phase
+        for k, v in result.items():
+            i = self._index.get(k)
+            if i is not None:
+                row[i] = json.dumps(v) if isinstance(v, (list, dict)) else v
+        if extra and self.extras_column:
+            row[self._index[self.extras_column]] = json.dumps({k: result[k] for k in extra})
+        return row
+
+    def _expand(self, missing: Sequence[str]) -> None:
+        self._fh.close()
+        self._open(_expand_csv_headers(self.filename, missing))
+
+    def flush(self) -> None:
+        if not self._fh.closed:
+            self._fh.flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+
+    def __enter__(self) -> "ResultsCSVWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_RESULT_WRITERS: Dict[str, ResultsCSVWriter] = {}
+
+
+def close_results_writers() -> None:
+    for writer in _RESULT_WRITERS.values():
+        writer.close()
+    _RESULT_WRITERS.clear()
+
+
+atexit.register(close_results_writers)
+
+
 def save_results_csv(result: Dict[str, Any],
                      phase: str,
                      filename: str = "logs/results.csv",
-                     headers: Optional[Sequence[str]] = None) -> None:
-    headers = list(headers) if headers else list(DEFAULT_CSV_HEADERS)
-
-    if headers[0] != "phase":
-        headers = ["phase"] + [h for h in headers if h != "phase"]
-
-    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
-    file_exists = os.path.exists(filename)
-
-    # Expand headers if new fields appear
-    extra = [k for k in result if k not in headers]
-    if extra and file_exists:
-        with open(filename, "r", newline="") as f:
-            reader = csv.reader(f)
-            existing = next(reader)
-        missing = [k for k in extra if k not in existing]
-        if missing:
-            rows = []
-            with open(filename, "r", newline="") as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            new_headers = existing + missing
-            with open(filename, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=new_headers)
-                writer.writeheader()
-                for r in rows:
-                    writer.writerow({h: r.get(h, "") for h in new_headers})
-            headers = new_headers
-
-    with open(filename, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        if not file_exists:
-            writer.writeheader()
-
-        row = {h: "" for h in headers}
-        row["phase"] = phase
-        for k, v in result.items():
-            if k in row:
-                row[k] = v
-        writer.writerow(row)
+                     headers: Optional[Sequence[str]] = None,
+                     flush: bool = True,
+                     extras_column: Optional[str] = None) -> None:
+    # One open writer per file, reused across calls. By default each row is
+    # flushed so readers of the file see it straight away; logging loops pass
+    # flush=False and let the writer flush in batches (and at exit)
+    key = os.path.abspath(filename)
+    writer = _RESULT_WRITERS.get(key)
+    if writer is None or writer._fh.closed or not os.path.exists(filename):
+        if writer is not None:
+            writer.close()
+        writer = _RESULT_WRITERS[key] = ResultsCSVWriter(
+            filename, headers, extras_column=extras_column)
+    else:
+        # The cached writer follows this call's setting; write() adds the
+        # extras column to the file the first time it is needed
+        writer.extras_column = extras_column
+    writer.write(phase, result)
+    if flush:
+        writer.flush()
@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+import pytest
+
+from simulator import build_simulator, plot_results
+
+
+@pytest.fixture
+def plot_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(plot_results, "LOG_PATH", str(tmp_path / "results.csv"))
+    monkeypatch.setattr(plot_results, "GRAPHS_DIR", str(tmp_path / "graphs"))
+    monkeypatch.setattr(plot_results, "CACHE_PATH", str(tmp_path / "results.parquet"))
+    monkeypatch.setattr(plot_results, "CACHE_KEY_PATH", str(tmp_path / "results.parquet.key"))
+    return tmp_path
+
+
+def _write_log(path):
+    rows = [
+        {"phase": "Build", "strategy": "Parallel Build", "total_time": 10, "speedup": 5, "efficiency": 1},
+        {"phase": "LoadBalancing", "algorithm": "Round Robin", "avg_load": 2, "variance": 0,
+         "fairness_index": 1, "load_imbalance": 0},
+        {"phase": "Scheduling", "algorithm": "FCFS", "avg_waiting": 1, "avg_turnaround": 3, "avg_response": 1},
+    ]
+    with open(path, "w", newline="") as f:
+        f.write(",".join(build_simulator.CSV_HEADERS) + "\n")
+        for r in rows:
+            f.write(",".join(str(x) for x in build_simulator._format_row(r)) + "\n")
+
+
+def test_import_has_no_side_effects():
+    assert callable(plot_results.main)
+    assert not hasattr(plot_results, "df")
+
+
+def test_renders_headless_with_agg():
+    import inspect
+    import matplotlib
+    assert matplotlib.get_backend().lower() == "agg"
+    assert "plt.show" not in inspect.getsource(plot_results)
+
+
+def test_main_writes_phase_graphs(plot_dirs):
+    _write_log(plot_dirs / "results.csv")
+    plot_results.main()
+    graphs = set(os.listdir(plot_dirs / "graphs"))
+    assert {"build_total_time.png", "lb_variance.png", "scheduling_times.png"} <= graphs
+
+
+def test_main_exits_without_log(plot_dirs):
+    with pytest.raises(SystemExit):
+        plot_results.main()
+
+
+def test_pad_ragged_pads_with_nan():
+    arr = plot_results.pad_ragged([[1, 2, 3], [4]])
+    assert arr.shape == (2, 3) and arr.dtype == "float32"
+    assert arr[1, 0] == 4 and np.isnan(arr[1, 1:]).all()
+    assert arr.flags.c_contiguous and arr[0].tolist() == [1, 2, 3]
+    assert plot_results.pad_ragged([[], [7.5, 8]]).tolist()[1] == [7.5, 8]
+
+
+def test_family_rows_match_short_and_long_names():
+    import pandas as pd
+    lb = pd.DataFrame({"algorithm": ["IRB LB", "Instance Resource Balancer", "RRB LB",
+                                     "Reinforcement LB", "TL-based CI/CD LB", None]})
+    assert len(plot_results.family_rows(lb, "IRB")) == 2
+    assert len(plot_results.family_rows(lb, "RRB")) == 2
+    assert plot_results.family_rows(lb, "TL")["algorithm"].tolist() == ["TL-based CI/CD LB"]
+    assert plot_results.family_rows(lb, "IoT").empty
+    assert plot_results.family_rows(lb.astype("category"), "RRB")["algorithm"].tolist() == ["RRB LB", "Reinforcement LB"]
+    assert plot_results.family_rows(pd.DataFrame({"phase": ["Build"]}), "IoT").empty
+
+
+def test_parse_columns_decodes_each_cell_once():
+    import pandas as pd
+    df = pd.DataFrame({"Q_values": ["[1.0, 2.0]", "[1.0, 2.0]", "[0.5]", "not a list", None],
+                       "final_Q": ["(1, 2)", None, None, None, None]})
+    parsed = plot_results.parse_columns(df)
+    assert parsed["Q_values"].tolist()[:3] == [[1.0, 2.0], [1.0, 2.0], [0.5]]
+    assert parsed["Q_values"][0] is parsed["Q_values"][1]
+    assert parsed["Q_values"].iloc[3:].isna().all()
+    assert parsed["final_Q"][0] == (1, 2)
+
+
+def test_load_results_groups_categorical_labels(plot_dirs):
+    _write_log(plot_dirs / "results.csv")
+    df = plot_results.load_results()
+    assert df["algorithm"].dtype == "category"
+    means = plot_results.phase_means(df)
+    assert plot_results.means_for(means, "Build", "strategy")["strategy"].tolist() == ["Parallel Build"]
+    assert plot_results.means_for(means, "Scheduling", "algorithm")["avg_turnaround"].tolist() == [3]
+
+
+def test_phase_groups_split_once_and_fill_missing():
+    import pandas as pd
+    df = pd.DataFrame({"phase": ["Scheduling", "Build", "Scheduling"], "algorithm": ["a", None, "b"]})
+    phases = plot_results.phase_groups(df)
+    assert phases["Scheduling"]["algorithm"].tolist() == ["a", "b"]
+    assert len(phases["Build"]) == 1
+    assert phases["LoadBalancing"].empty and list(phases["LoadBalancing"].columns) == ["phase", "algorithm"]
+
+
+@pytest.mark.parametrize("error", [OSError, ValueError, ImportError])
+def test_load_results_survives_a_failing_cache_write(plot_dirs, monkeypatch, error):
+    import pandas as pd
+    _write_log(plot_dirs / "results.csv")
+
+    def broken(*args, **kwargs):
+        raise error("no cache")
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", broken)
+    frame = plot_results.load_results()
+    assert len(frame) == 3
+    assert not (plot_dirs / "results.parquet.key").exists()
+
+
+def test_load_results_survives_an_unwritable_cache_dir(plot_dirs, monkeypatch):
+    _write_log(plot_dirs / "results.csv")
+    monkeypatch.setattr(plot_results, "CACHE_PATH", str(plot_dirs / "missing" / "results.parquet"))
+    monkeypatch.setattr(plot_results, "CACHE_KEY_PATH", str(plot_dirs / "missing" / "results.parquet.key"))
+    assert len(plot_results.load_results()) == 3
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import pytest
 from unittest.mock import patch
 from simulator import build_simulator
@@ -78,3 +81,262 @@ def test_scheduling_phase_hrrn():
         "4"                  
     ]):
         build_simulator.scheduling_phase()
+
+
+@pytest.fixture
+def tmp_log(tmp_path, monkeypatch):
+    build_simulator.flush_results()
+    log = tmp_path / "results.csv"
+    monkeypatch.setattr(build_simulator, "LOG_FILE", str(log))
+    monkeypatch.setattr(build_simulator, "_LOG_FH", None)
+    monkeypatch.setattr(build_simulator, "_WRITER", None)
+    return log
+
+
+def test_save_results_writes_header_once(tmp_log):
+    log = tmp_log
+    build_simulator.save_results({"phase": "Build", "strategy": "Sequential Build", "total_time": 15})
+    build_simulator.save_results({"phase": "Scheduling", "algorithm": "FCFS", "avg_waiting": 1.5})
+    build_simulator.flush_results()
+
+    lines = log.read_text().splitlines()
+    assert lines[0] == ",".join(build_simulator.CSV_HEADERS)
+    assert len(lines) == 3
+    assert lines[1].startswith("Build,Sequential Build,,15,")
+
+
+def test_batch_mode_scheduling(tmp_log):
+    build_simulator.main(["--phase", "scheduling", "--algo", "fcfs",
+                          "--n", "50", "--repeat", "3", "--seed", "7"])
+    lines = tmp_log.read_text().splitlines()
+    assert len(lines) == 4
+    assert all(l.startswith("Scheduling,,FCFS,") for l in lines[1:])
+
+
+def test_batch_mode_rejects_unknown_algo():
+    with pytest.raises(SystemExit):
+        build_simulator.main(["--phase", "lb", "--algo", "nope", "--n", "3"])
+
+
+def test_batch_mode_all_algorithms(tmp_log):
+    build_simulator.main(["--phase", "lb", "--algo", "all", "--n", "4", "--requests", "20"])
+    rows = tmp_log.read_text().splitlines()[1:]
+    assert len(rows) == len(build_simulator._LB_DISPATCH)
+
+
+def test_save_results_header_for_empty_existing_log(tmp_log):
+    tmp_log.write_text("")
+    build_simulator.save_results({"phase": "Build", "strategy": "Parallel Build"})
+    build_simulator.flush_results()
+    lines = tmp_log.read_text().splitlines()
+    assert lines[0] == ",".join(build_simulator.CSV_HEADERS)
+    assert len(lines) == 2
+
+
+def test_batch_mode_parallel_matches_sequential(tmp_log):
+    argv = ["--phase", "scheduling", "--algo", "all", "--n", "40",
+            "--repeat", "2", "--seed", "3"]
+    build_simulator.main(argv)
+    build_simulator.main(argv + ["--workers", "2"])
+    rows = tmp_log.read_text().splitlines()[1:]
+    assert len(rows) == 16
+    assert rows[:8] == rows[8:]
+
+
+def test_import_defers_strategies_and_numpy():
+    code = ("import sys, simulator.build_simulator; "
+            "print('simulator.strategy' in sys.modules, 'numpy' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
+
+
+def test_save_results_formats_float_columns(tmp_log):
+    build_simulator.save_results({"phase": "LoadBalancing", "algorithm": "Random",
+                                  "avg_load": 10 / 3, "max_load": 5, "fairness_index": 2 / 3})
+    build_simulator.flush_results()
+    row = tmp_log.read_text().splitlines()[1].split(",")
+    cols = dict(zip(build_simulator.CSV_HEADERS, row))
+    assert cols["avg_load"] == "3.33"
+    assert cols["max_load"] == "5"
+    assert cols["fairness_index"] == "0.6667"
+    assert cols["avg_waiting"] == ""
+
+
+def test_batch_mode_seed_reproduces_lb_runs(tmp_log):
+    argv = ["--phase", "lb", "--algo", "random", "--n", "5", "--requests", "40", "--seed", "11"]
+    build_simulator.main(argv)
+    build_simulator.main(argv)
+    rows = tmp_log.read_text().splitlines()[1:]
+    assert rows[0] == rows[1]
+
+
+def test_distribution_preview_lists_busy_services():
+    assert build_simulator._distribution_preview([0, 3, 0, 1]) == "Busy services (id:load): 1:3, 3:1"
+    assert build_simulator._distribution_preview([0, 0]) == "Busy services: none"
+    assert build_simulator._distribution_preview([1] * 25, limit=2).endswith("(+23 more)")
+    # Busy services spread across several scan blocks
+    sparse = [0] * 50
+    sparse[3], sparse[17], sparse[41] = 2, 5, 7
+    assert (build_simulator._distribution_preview(sparse, limit=2, block=8)
+            == "Busy services (id:load): 3:2, 17:5 (+1 more)")
+
+
+def test_cli_accepts_numeric_and_named_choices(tmp_log):
+    with patch("builtins.input", side_effect=["1", "3", "5", "1", "sched", "4", "2", "4"]):
+        build_simulator.SimCLI().cmdloop()
+    rows = tmp_log.read_text().splitlines()[1:]
+    assert [r.split(",")[0] for r in rows] == ["Build", "Scheduling"]
+
+
+def test_save_results_parquet_format(tmp_log, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(build_simulator, "LOG_FORMAT", "parquet")
+    monkeypatch.setattr(build_simulator, "PARQUET_BATCH_ROWS", 2)
+    monkeypatch.setattr(build_simulator, "_PQ_ROWS", [])
+    monkeypatch.setattr(build_simulator, "_PQ_WRITER", None)
+
+    for i in range(3):
+        build_simulator.save_results({"phase": "Scheduling", "algorithm": "FCFS", "avg_waiting": i})
+    build_simulator._close_parquet()
+
+    [path] = tmp_log.parent.glob("results-*.parquet")
+    table = pq.read_table(path)
+    assert table.num_rows == 3
+    assert table.column("avg_waiting").to_pylist() == [0.0, 1.0, 2.0]
+    assert table.column("strategy").to_pylist() == [None] * 3
+    assert not tmp_log.exists()
+
+
+def test_interactive_main_warms_kernels_in_background(monkeypatch):
+    import threading
+    warmed = threading.Event()
+    monkeypatch.setattr(build_simulator, "_warm", warmed.set)
+    monkeypatch.setattr(build_simulator, "_numba_available", lambda: True)
+    with patch.object(build_simulator.SimCLI, "cmdloop"):
+        build_simulator.main([])
+    assert warmed.wait(5)
+
+
+def test_interactive_main_skips_warmup_without_numba(monkeypatch):
+    monkeypatch.setattr(build_simulator, "_numba_available", lambda: False)
+    with patch.object(build_simulator.SimCLI, "cmdloop"), \
+            patch.object(build_simulator.threading, "Thread") as thread:
+        build_simulator.main([])
+    thread.assert_not_called()
+    code = "import sys; sys.modules['numba'] = None; from simulator import build_simulator as b; print(b._numba_available())"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False"]
+
+
+def test_read_helpers_skip_comments_and_reject_malformed(capsys):
+    with patch("builtins.input", side_effect=["# services", "abc", "1.5", " 42 "]):
+        assert build_simulator._read_int("n: ") == 42
+    with patch("builtins.input", side_effect=["# factor", "0.5.1", "nan", "-2.5e-1"]):
+        assert build_simulator._read_float("f: ") == -0.25
+    out = capsys.readouterr().out
+    assert out.count("Enter a valid integer.") == 2
+    assert out.count("Enter a valid number.") == 2
+
+
+def test_cli_skips_comment_lines(tmp_log, capsys):
+    with patch("builtins.input", side_effect=["# build 5 jobs", "1", "5", "# minutes each", "3", "1", "4"]):
+        build_simulator.SimCLI().cmdloop()
+    assert "Unknown choice" not in capsys.readouterr().out
+    assert tmp_log.read_text().splitlines()[1].startswith("Build")
+
+
+def test_save_results_many_appends_rows_in_order(tmp_log):
+    build_simulator.save_results_many(
+        [{"phase": "Scheduling", "algorithm": a, "avg_waiting": w} for a, w in (("FCFS", 2), ("SJF", 1.25))]
+    )
+    build_simulator.save_results_many([])
+    build_simulator.flush_results()
+    lines = tmp_log.read_text().splitlines()
+    assert lines[0] == ",".join(build_simulator.CSV_HEADERS)
+    assert [l.split(",")[2] for l in lines[1:]] == ["FCFS", "SJF"]
+    assert lines[2].split(",")[12] == "1.25"
+
+
+def test_scheduling_workload_is_vectorized_and_seeded(monkeypatch):
+    import simulator
+    seen = []
+
+    def fake(arrival, burst):
+        seen.append((arrival.tolist(), burst.tolist()))
+        return {"avg_waiting": 0.0, "avg_turnaround": 0.0, "avg_response": 0.0}
+
+    monkeypatch.setattr(simulator, "fcfs_scheduling", fake)
+    build_simulator._run_scheduling(500, 1, seed=7)
+    build_simulator._run_scheduling(500, 1, seed=7)
+    (arrival, burst), again = seen
+    assert (arrival, burst) == again
+    assert len(arrival) == len(burst) == 500
+    assert 0 <= min(arrival) and max(arrival) <= 50
+    assert 1 <= min(burst) and max(burst) <= 20
+
+
+def test_batch_mode_schedules_jobs_file(tmp_log, tmp_path):
+    jobs = tmp_path / "jobs.csv"
+    jobs.write_text("arrival,burst\n# a comment\n0,5\n1,3\n2,1\n")
+    build_simulator.main(["--phase", "scheduling", "--algo", "srtf", "--jobs", str(jobs)])
+    row = tmp_log.read_text().splitlines()[1].split(",")
+    assert row[2] == "SRTF"
+    assert row[12:] == ["1.67", "4.67", "0.00"]
+
+
+def test_batch_mode_rejects_jobs_outside_scheduling(tmp_path):
+    with pytest.raises(SystemExit):
+        build_simulator.main(["--phase", "lb", "--algo", "random", "--jobs", str(tmp_path / "j.csv")])
+    with pytest.raises(SystemExit):
+        build_simulator.main(["--phase", "scheduling", "--algo", "fcfs"])
+
+
+def test_scheduling_phase_takes_jobs_without_prompting(tmp_log):
+    with patch("builtins.input", side_effect=AssertionError("prompted")):
+        build_simulator.scheduling_phase([4, 0], [2, 3], choice=1)
+    build_simulator.flush_results()
+    assert tmp_log.read_text().splitlines()[1].startswith("Scheduling,,FCFS,")
+
+
+def test_background_writer_errors_surface_on_flush(tmp_log, monkeypatch):
+    def boom(row):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(build_simulator, "_format_row", boom)
+    build_simulator.save_results({"phase": "Build"})
+    with pytest.raises(OSError, match="disk full"):
+        build_simulator.flush_results()
+    build_simulator.flush_results()
+
+
+def test_format_row_places_known_keys_and_drops_unknown():
+    row = build_simulator._format_row({"avg_waiting": 2, "phase": "Scheduling", "extra": "x"})
+    assert len(row) == len(build_simulator.CSV_HEADERS)
+    assert row[0] == "Scheduling"
+    assert row[build_simulator.CSV_HEADERS.index("avg_waiting")] == "2.00"
+    assert "x" not in row
+
+
+def test_batch_mode_reads_jobs_from_stdin(tmp_log, monkeypatch):
+    import io
+    monkeypatch.setattr(sys, "stdin", io.StringIO("# arrival burst\n0 5\n1 3 2\n1\n"))
+    build_simulator.main(["--phase", "scheduling", "--algo", "srtf", "--jobs", "-"])
+    row = tmp_log.read_text().splitlines()[1].split(",")
+    assert row[12:] == ["1.67", "4.67", "0.00"]
+
+
+def test_bulk_read_pairs_rejects_odd_token_count():
+    import io
+    with pytest.raises(ValueError):
+        build_simulator._bulk_read_pairs(io.StringIO("0 5\n1\n"))
+
+
+def test_bulk_read_pairs_skips_only_a_leading_header():
+    import io
+    read = build_simulator._bulk_read_pairs
+    assert read(io.StringIO("# jobs\narrival,burst,priority\n0,5\n1,3\n")) == ([0, 1], [5, 3])
+    assert read(io.StringIO("\n0 5\n")) == ([0], [5])
+    with pytest.raises(ValueError, match="'1x'"):
+        read(io.StringIO("1x 5\n2 3\n"))
+    with pytest.raises(ValueError, match="'arrival'"):
+        read(io.StringIO("0 5\narrival burst\n"))
@@ -1,4 +1,9 @@
+import json
+import subprocess
+import sys
+
 import pytest
+import numpy as np
 from simulator import strategy
 
 def test_sequential_build():
@@ -48,6 +53,8 @@ def test_genetic_algorithm_load():
     dist = metrics["distribution"]
     assert sum(dist) == 20
     assert len(dist) == 4
+    # Individuals start as multinomial rows, so huge request counts are cheap
+    assert sum(strategy.genetic_algorithm_load(10**9, 6, generations=3)["distribution"]) == 10**9
 
 def test_fcfs_scheduling():
     at = [0, 1, 2]
@@ -77,3 +84,334 @@ def test_hrrn_scheduling():
     assert len(result["completion_times"]) == 3
     assert result["avg_waiting"] >= 0
     assert result["avg_turnaround"] >= 0
+
+def test_package_exports_resolve_to_strategy():
+    import simulator
+    for name in simulator.__all__:
+        assert getattr(simulator, name) is getattr(strategy, name)
+    with pytest.raises(AttributeError):
+        simulator.not_a_strategy
+
+def test_set_seed_makes_random_strategies_reproducible():
+    runs = []
+    for _ in range(2):
+        strategy.set_seed(42)
+        runs.append((strategy.random_load(50, 5)["distribution"],
+                     strategy.genetic_algorithm_load(50, 5, generations=5)["distribution"]))
+    assert runs[0] == runs[1]
+
+def test_least_connections_load_does_not_mutate_input():
+    import numpy as np
+    initial = np.zeros(3, dtype=np.int32)
+    metrics = strategy.least_connections_load(7, initial)
+    assert sum(metrics["distribution"]) == 7
+    assert initial.tolist() == [0, 0, 0]
+    assert strategy.least_connections_load(4, (1, 0))["distribution"] == [3, 2]
+
+def test_warm_kernels_runs():
+    strategy.warm_kernels()
+
+
+def test_compute_load_metrics_single_pass_matches_statistics():
+    import statistics
+    dist = [7, 0, 3, 12, 5, 5]
+    res = strategy.compute_load_metrics(dist)
+    assert res["max_load"] == 12 and res["min_load"] == 0
+    assert res["load_imbalance"] == 12
+    assert abs(res["variance"] - statistics.pvariance(dist)) < 1e-9
+    assert abs(res["fairness_index"] - sum(dist) ** 2 / (len(dist) * sum(x * x for x in dist))) < 1e-12
+
+def test_scheduling_orders_jobs_by_arrival():
+    # Job 1 arrives first even though it is listed second
+    result = strategy.fcfs_scheduling([4, 0], [2, 3])
+    assert result["completion_times"] == [6, 3]
+    assert result["avg_waiting"] == 0.0
+
+def test_srtf_preempts_on_shorter_arrival():
+    result = strategy.srtf_scheduling([0, 1, 2], [5, 3, 1])
+    assert result["completion_times"] == [9, 5, 3]
+    assert result["response_times"] == [0, 0, 0]
+    assert result["avg_waiting"] == pytest.approx(5 / 3)
+
+def test_sjf_and_hrrn_are_non_preemptive():
+    for fn in (strategy.sjf_scheduling, strategy.hrrn_scheduling):
+        result = fn([0, 1, 2], [5, 3, 1])
+        assert result["completion_times"] == [5, 9, 6]
+        assert result["waiting_times"] == result["response_times"]
+
+def test_scheduling_accepts_arrays_and_empty_input():
+    import numpy as np
+    at = np.array([0, 1, 2], dtype=np.int32)
+    bt = np.array([5, 3, 8], dtype=np.int32)
+    assert strategy.fcfs_scheduling(at, bt) == strategy.fcfs_scheduling([0, 1, 2], [5, 3, 8])
+    assert strategy.hrrn_scheduling([], [])["avg_waiting"] == 0.0
+
+def test_irb_load_follows_capacity():
+    caps = strategy.ServiceCaps.from_dicts([
+        {"cpu_capacity": 10, "mem_capacity": 8, "cpu_cost": 1, "mem_cost": 1},
+        {"cpu_capacity": 20, "mem_capacity": 16, "cpu_cost": 1, "mem_cost": 1},
+    ])
+    assert caps.cpu_cap.dtype == "float32" and len(caps) == 2
+    result = strategy.irb_load(30, caps)
+    assert result["distribution"] == [10, 20]
+    assert strategy.irb_load(30, caps.to_dicts())["distribution"] == [10, 20]
+    assert result["service_capacities_summary"][1]["cpu_capacity"] == 20
+
+def test_service_caps_from_dicts_defaults_costs():
+    caps = strategy.ServiceCaps.from_dicts([
+        {"cpu_capacity": 4, "mem_capacity": 2},
+        {"cpu_capacity": 6, "mem_capacity": 3, "cpu_cost": 2, "mem_cost": 5},
+    ])
+    assert caps.mem_cap.tolist() == [2, 3] and caps.cpu_cost.tolist() == [1, 2]
+    assert caps.mem_cost.flags.c_contiguous and len(strategy.ServiceCaps.from_dicts([])) == 0
+    with pytest.raises(KeyError):
+        strategy.ServiceCaps.from_dicts([{"mem_capacity": 1}])
+
+def test_irb_load_water_fill_matches_greedy_loop():
+    caps = strategy.ServiceCaps(*(np.array(c, dtype=np.float32) for c in
+                                  ([3, 1, 2, 3], [1, 2, 2, 4], [1, 1, 2, 3], [2, 1, 1, 1])))
+    unit = (caps.cpu_cost / caps.cpu_cap + caps.mem_cost / caps.mem_cap).astype(np.float64)
+    for requests in (0, 1, 5, 37, 1000):
+        expected = np.zeros(4, dtype=np.int64)
+        for _ in range(requests):
+            expected[int(np.argmin((expected + 1) * unit))] += 1
+        assert strategy.irb_load(requests, caps)["distribution"] == expected.tolist()
+
+def test_random_load_counts_every_request():
+    strategy.set_seed(11)
+    first = strategy.random_load(200, 7)["distribution"]
+    strategy.set_seed(11)
+    assert strategy.random_load(200, 7)["distribution"] == first
+    assert len(first) == 7 and sum(first) == 200
+    assert sum(strategy.iot_lb_load(50, [{}] * 4)["distribution"]) == 50
+    with pytest.raises(ValueError):
+        strategy.random_load(5, 0)
+    # One multinomial draw: cost depends on the service count, not on requests
+    big = strategy.random_load(10**12, 4)
+    assert sum(big["distribution"]) == 10**12
+    assert big["variance"] >= 0 and 0 < big["fairness_index"] <= 1
+
+def test_iot_lb_load_favours_responsive_instances():
+    fast = {"latency": 5, "network_delay": 2, "cpu_temp": 40}
+    slow = {"latency": 500, "network_delay": 200, "cpu_temp": 90}
+    strategy.set_seed(3)
+    d = strategy.iot_lb_load(10_000, [slow, fast, slow])["distribution"]
+    assert sum(d) == 10_000 and d[1] > d[0] + d[2]
+
+def test_tl_lb_load_routes_to_first_best_q():
+    assert strategy.tl_lb_load(9, 4, [0.2, 0.9, 0.9, 0.1, 5.0])["distribution"] == [0, 9, 0, 0]
+    assert strategy.tl_lb_load(0, 2, [])["distribution"] == [0, 0]
+
+def test_rrb_load_is_seeded_and_routes_every_request():
+    strategy.set_seed(5)
+    first = strategy.rrb_load(1000, 6)
+    strategy.set_seed(5)
+    assert strategy.rrb_load(1000, 6)["distribution"] == first["distribution"]
+    assert sum(first["distribution"]) == 1000 and len(first["Q_values"]) == 6
+    assert first["load_imbalance"] < 100
+    assert strategy.rrb_load(0, 0)["distribution"] == []
+
+def test_load_metrics_accepts_arrays_and_returns_lists():
+    result = strategy.compute_load_metrics(np.array([3, 1, 2], dtype=np.int64))
+    assert result["distribution"] == [3, 1, 2] and type(result["distribution"]) is list
+    assert type(result["max_load"]) is int and result["variance"] == pytest.approx(2 / 3)
+    assert strategy.compute_load_metrics(np.array([], dtype=np.int64))["distribution"] == []
+
+def test_rrb_greedy_heap_matches_argmax():
+    for n in (5, 100):
+        Q, dist = np.ones(n), np.zeros(n, dtype=np.int64)
+        for _ in range(3000):
+            i = int(np.argmax(Q))
+            dist[i] += 1
+            Q[i] += 0.2 * (1.0 / (1.0 + dist[i]) - Q[i])
+        assert strategy.rrb_load(3000, n, epsilon=0.0)["distribution"] == dist.tolist()
+
+def test_round_robin_closed_form_matches_loop():
+    for requests, n in ((0, 3), (7, 3), (9, 3), (2, 5), (100, 7)):
+        expected = [0] * n
+        for i in range(requests):
+            expected[i % n] += 1
+        assert strategy.round_robin_load(requests, n)["distribution"] == expected
+
+def test_least_connections_heap_matches_linear_scan():
+    rng = np.random.default_rng(8)
+    for _ in range(40):
+        loads = rng.integers(0, 6, int(rng.integers(1, 9))).tolist()
+        requests = int(rng.integers(0, 60))
+        expected = list(loads)
+        for _ in range(requests):
+            expected[expected.index(min(expected))] += 1
+        assert strategy.least_connections_load(requests, loads)["distribution"] == expected
+
+def test_least_connections_heap_breaks_ties_by_index():
+    result = strategy.least_connections_load(5, [2, 0, 0, 3])
+    assert result["distribution"] == [3, 2, 2, 3]
+    with pytest.raises(ValueError):
+        strategy.least_connections_load(1, [])
+
+def test_strategy_all_covers_package_exports():
+    import simulator
+    assert set(simulator.__all__) <= set(strategy.__all__)
+    assert all(callable(getattr(strategy, name)) for name in strategy.__all__)
+
+def test_fcfs_closed_form_matches_loop():
+    rng = np.random.default_rng(4)
+    for _ in range(50):
+        n = int(rng.integers(1, 30))
+        at = rng.integers(0, 40, n).tolist()
+        bt = rng.integers(1, 6, n).tolist()
+        time, ct = 0, [0] * n
+        for i in sorted(range(n), key=at.__getitem__):
+            time = max(time, at[i]) + bt[i]
+            ct[i] = time
+        assert strategy.fcfs_scheduling(at, bt)["completion_times"] == ct
+
+def test_irb_load_breaks_score_ties_by_lowest_index():
+    assert strategy.irb_load(5, strategy.ServiceCaps.full(3))["distribution"] == [2, 2, 1]
+    assert strategy.irb_load(1, strategy.ServiceCaps.full(4))["distribution"] == [1, 0, 0, 0]
+
+def test_srtf_matches_unit_tick_simulation():
+    rng = np.random.default_rng(12)
+    for _ in range(40):
+        n = int(rng.integers(1, 12))
+        at = rng.integers(0, 15, n).tolist()
+        bt = rng.integers(0, 6, n).tolist()
+        rem, ct, time = list(bt), [None] * n, 0
+        while any(c is None for c in ct):
+            ready = [i for i in sorted(range(n), key=at.__getitem__)
+                     if ct[i] is None and at[i] <= time]
+            if not ready:
+                time = min(at[i] for i in range(n) if ct[i] is None)
+                continue
+            i = min(ready, key=rem.__getitem__)
+            if rem[i]:
+                rem[i] -= 1
+                time += 1
+            if rem[i] == 0:
+                ct[i] = time
+        assert strategy.srtf_scheduling(at, bt)["completion_times"] == ct
+
+def test_hrrn_matches_ratio_scan():
+    from fractions import Fraction
+    rng = np.random.default_rng(21)
+    for _ in range(40):
+        n = int(rng.integers(1, 12))
+        at = rng.integers(0, 20, n).tolist()
+        bt = rng.integers(0, 7, n).tolist()
+        pending = sorted(range(n), key=at.__getitem__)
+        ct, time = [0] * n, 0
+        while pending:
+            time = max(time, at[pending[0]])
+            ready = [i for i in pending if at[i] <= time]
+            ratio = lambda i: Fraction(time - at[i] + bt[i], bt[i]) if bt[i] else float("inf")
+            i = max(ready, key=ratio)
+            pending.remove(i)
+            time += bt[i]
+            ct[i] = time
+        assert strategy.hrrn_scheduling(at, bt)["completion_times"] == ct
+
+def test_sjf_heap_matches_ready_set_scan():
+    rng = np.random.default_rng(30)
+    for _ in range(40):
+        n = int(rng.integers(1, 12))
+        at = rng.integers(0, 20, n).tolist()
+        bt = rng.integers(0, 7, n).tolist()
+        pending = sorted(range(n), key=at.__getitem__)
+        ct, time = [0] * n, 0
+        while pending:
+            time = max(time, at[pending[0]])
+            i = min((i for i in pending if at[i] <= time), key=bt.__getitem__)
+            pending.remove(i)
+            time += bt[i]
+            ct[i] = time
+        assert strategy.sjf_scheduling(at, bt)["completion_times"] == ct
+
+def test_schedulers_jump_over_idle_gaps():
+    at, bt = [0, 10**15, 10**15 + 1], [3, 5, 1]
+    for fn in (strategy.srtf_scheduling, strategy.hrrn_scheduling, strategy.sjf_scheduling):
+        assert fn(at, bt)["completion_times"][0] == 3
+        assert max(fn(at, bt)["completion_times"]) == 10**15 + 6
+
+def test_schedulers_reject_mismatched_job_arrays():
+    with pytest.raises(ValueError):
+        strategy.fcfs_scheduling([0, 1, 2], [3, 1])
+    with pytest.raises(ValueError):
+        strategy.srtf_scheduling([[0, 1]], [[1, 1]])
+    at = np.array([0, 2], dtype=np.int64)
+    assert strategy._prep(at, np.array([1, 1], dtype=np.int64))[0] is at
+
+
+def _run_without_numba(code):
+    # Runs `code` in a fresh interpreter where `import numba` fails
+    prelude = "import sys; sys.modules['numba'] = None\n"
+    out = subprocess.run([sys.executable, "-c", prelude + code],
+                         capture_output=True, text=True, check=True)
+    return out.stdout
+
+
+def test_schedulers_without_numba_match_compiled():
+    arrival = [0, 3, 1, 9, 2, 2]
+    burst = [4, 1, 0, 2, 5, 3]
+    code = ("import json; from simulator import strategy\n"
+            "assert not strategy.HAVE_NUMBA\n"
+            "print(json.dumps([getattr(strategy, f)(%r, %r) for f in %r]))"
+            % (arrival, burst, ["fcfs_scheduling", "sjf_scheduling", "srtf_scheduling", "hrrn_scheduling"]))
+    interpreted = json.loads(_run_without_numba(code))
+    compiled = [strategy.fcfs_scheduling(arrival, burst), strategy.sjf_scheduling(arrival, burst),
+                strategy.srtf_scheduling(arrival, burst), strategy.hrrn_scheduling(arrival, burst)]
+    assert interpreted == compiled
+
+
+def test_interpreted_ga_and_rrb_leave_numpy_global_rng_alone():
+    code = ("import numpy as np; from simulator import strategy\n"
+            "np.random.seed(123); expected = np.random.random(3).tolist()\n"
+            "np.random.seed(123)\n"
+            "runs = []\n"
+            "for _ in range(2):\n"
+            "    strategy.set_seed(9)\n"
+            "    runs.append((strategy.genetic_algorithm_load(200, 5)['distribution'],\n"
+            "                 strategy.rrb_load(200, 5)['distribution']))\n"
+            "assert runs[0] == runs[1] and sum(runs[0][0]) == 200 and sum(runs[0][1]) == 200\n"
+            "print(np.random.random(3).tolist() == expected)")
+    assert _run_without_numba(code).split() == ["True"]
+
+
+def test_load_metrics_survive_loads_past_int64_squares():
+    m = strategy.compute_load_metrics([4 * 10**9] * 2)
+    assert m["variance"] == 0.0 and m["fairness_index"] == 1.0
+    m = strategy.compute_load_metrics(np.array([4 * 10**9, 5 * 10**9]))
+    assert m["variance"] == pytest.approx(0.25e18)
+    assert m["fairness_index"] == pytest.approx(81 / 82)
+
+
+def test_load_metrics_variance_is_centred_on_large_integer_loads():
+    loads = [10**12 + i % 3 for i in range(10)]
+    m = strategy.compute_load_metrics(loads)
+    assert m["variance"] == pytest.approx(np.var(np.array(loads) - 10**12))
+    assert m["average_load"] == 10**12 + 0.9
+
+
+def test_load_metrics_agree_with_utils_on_large_float_loads():
+    from simulator import utils
+    loads = np.random.default_rng(2).uniform(1e8, 1e8 + 3, 50)
+    ours = strategy.compute_load_metrics(loads)
+    theirs = utils.compute_distribution_metrics(loads)
+    assert ours["variance"] == pytest.approx(theirs["variance"], rel=1e-9)
+    assert ours["variance"] == pytest.approx(loads.var(), rel=1e-9)
+    assert ours["fairness_index"] == pytest.approx(theirs["fairness_index"])
+
+
+def test_interpreted_hrrn_stays_fast_and_matches_compiled():
+    rng = np.random.default_rng(4)
+    arrival = np.sort(rng.integers(0, 20_000, 5000)).tolist()
+    burst = rng.integers(0, 8, 5000).tolist()
+    code = ("import json, time; from simulator import strategy\n"
+            "arrival, burst = json.loads(input())\n"
+            "start = time.perf_counter()\n"
+            "ct = strategy.hrrn_scheduling(arrival, burst)['completion_times']\n"
+            "print(json.dumps([time.perf_counter() - start, ct]))")
+    out = subprocess.run([sys.executable, "-c", "import sys; sys.modules['numba'] = None\n" + code],
+                         input=json.dumps([arrival, burst]), capture_output=True, text=True, check=True)
+    elapsed, ct = json.loads(out.stdout)
+    assert ct == strategy.hrrn_scheduling(arrival, burst)["completion_times"]
+    assert elapsed < 5.0
@@ -0,0 +1,276 @@
+import array
+import csv
+import json
+import statistics
+
+import numpy as np
+import pytest
+
+from simulator import utils
+
+
+def test_save_results_csv_writes_nested_values_as_json(tmp_path):
+    path = tmp_path / "results.csv"
+    caps = [{"cpu_capacity": 2, "mem_capacity": 4}]
+    utils.save_results_csv({"algorithm": "RRB LB", "Q_values": [0.5, 1.0], "caps": caps},
+                           "LoadBalancing", filename=str(path),
+                           headers=utils.DEFAULT_CSV_HEADERS + ["caps"])
+    with open(path, newline="") as f:
+        row = next(csv.DictReader(f))
+    assert row["phase"] == "LoadBalancing"
+    assert json.loads(row["Q_values"]) == [0.5, 1.0]
+    assert json.loads(row["caps"]) == caps
+
+
+def test_save_results_csv_places_values_by_header(tmp_path):
+    path = tmp_path / "results.csv"
+    utils.save_results_csv({"algorithm": "FCFS", "avg_waiting": 1.5, "nope": 1},
+                           "Scheduling", filename=str(path))
+    utils.save_results_csv({"strategy": "Parallel Build", "total_time": 10}, "Build", filename=str(path))
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    header = rows[0]
+    assert header == utils.DEFAULT_CSV_HEADERS
+    first = dict(zip(header, rows[1]))
+    assert first["phase"] == "Scheduling" and first["avg_waiting"] == "1.5"
+    assert dict(zip(header, rows[2]))["total_time"] == "10"
+
+
+def test_results_writer_keeps_file_open_and_expands_headers(tmp_path):
+    path = tmp_path / "results.csv"
+    with utils.ResultsCSVWriter(str(path), headers=["phase", "algorithm"]) as writer:
+        writer.write("Scheduling", {"algorithm": "FCFS", "late": 1})
+        writer.write("Scheduling", {"algorithm": "SJF"})
+        writer.flush()
+        with open(path, newline="") as f:
+            assert len(list(csv.reader(f))) == 3
+        writer.write("Scheduling", {"algorithm": "HRRN", "avg_waiting": 2})
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["phase", "algorithm", "avg_waiting"]
+    assert rows[1] == ["Scheduling", "FCFS", ""] and rows[3] == ["Scheduling", "HRRN", "2"]
+
+    # Reopening an existing file appends under its own header
+    with utils.ResultsCSVWriter(str(path)) as writer:
+        writer.write("Scheduling", {"avg_waiting": 4})
+    with open(path, newline="") as f:
+        assert list(csv.reader(f))[-1] == ["Scheduling", "", "4"]
+
+
+def test_distribution_helpers_accept_lists_and_arrays():
+    dist = [3, 1, 4, 1, 5]
+    for d in (dist, np.array(dist), np.array(dist, dtype=np.float64)):
+        assert utils.average_load(d) == pytest.approx(2.8)
+        assert utils.max_load(d) == 5.0 and utils.min_load(d) == 1.0
+        assert utils.fairness_index(d) == pytest.approx(14 ** 2 / (5 * 52))
+        assert utils.load_imbalance(d) == pytest.approx(5 / 2.8 - 1)
+    for empty in ([], np.array([])):
+        assert utils.average_load(empty) == 0.0 and utils.max_load(empty) == 0.0
+        assert utils.fairness_index(empty) == 1.0 and utils.load_imbalance(empty) == 0.0
+
+
+def test_compute_distribution_metrics_matches_the_helpers():
+    dist = [7, 0, 2, 9, 2, 5]
+    metrics = utils.compute_distribution_metrics(np.array(dist))
+    assert metrics == pytest.approx({
+        "avg_load": utils.average_load(dist),
+        "max_load": utils.max_load(dist),
+        "min_load": utils.min_load(dist),
+        "variance": utils.variance_load(dist),
+        "fairness_index": utils.fairness_index(dist),
+        "load_imbalance": utils.load_imbalance(dist),
+    })
+    assert set(metrics) <= set(utils.DEFAULT_CSV_HEADERS)
+    assert utils.compute_distribution_metrics([4.0])["variance"] == 0.0
+
+    # Large, near-uniform loads keep their variance: both the compiled and
+    # the NumPy reductions centre on the mean
+    for size in (10, 20000):
+        offset = [1e8 + i % 3 for i in range(size)]
+        var = utils.compute_distribution_metrics(offset)["variance"]
+        assert var == pytest.approx(np.var(offset), rel=1e-9)
+        assert var == pytest.approx(utils.variance_load(offset), rel=1e-9)
+    assert utils.compute_distribution_metrics([])["fairness_index"] == 1.0
+
+
+def test_rl_update_on_arrays_matches_the_list_path():
+    Q_list = [0.0, 1.0, 0.5]
+    Q_arr = np.array(Q_list)
+    steps = [(0, 1.0), (2, 0.0), (0, 0.5), (1, 2.0), (0, 1.0)]
+    for idx, reward in steps:
+        expected = utils.rl_update(Q_list, idx, reward)
+        assert utils.rl_update(Q_arr, idx, reward) == pytest.approx(expected)
+    assert Q_arr.tolist() == pytest.approx(Q_list)
+
+    Q_batch = np.array([0.0, 1.0, 0.5])
+    utils.rl_update_batch(Q_batch, [i for i, _ in steps], [r for _, r in steps])
+    assert Q_batch.tolist() == pytest.approx(Q_list)
+    with pytest.raises(IndexError):
+        utils.rl_update_batch(Q_batch, [3], [1.0])
+
+
+def test_variance_and_stdev_match_statistics():
+    dist = [0.1, 2.5, 2.5, 9.75, 3.0]
+    assert utils.variance_load(np.array(dist)) == pytest.approx(statistics.pvariance(dist))
+    assert utils.stdev_load(dist) == pytest.approx(statistics.pstdev(dist))
+    assert utils.variance_load([5]) == 0.0 and utils.stdev_load([]) == 0.0
+
+
+def test_metric_helpers_memoize_small_sequences():
+    utils.clear_metric_cache()
+    dist = [1.0, 2.0, 6.0]
+    first = utils.fairness_index(dist)
+    assert utils.fairness_index(list(dist)) == first
+    assert utils.fairness_index.cache_info().hits == 1
+    dist.append(3.0)
+    assert utils.fairness_index(dist) != first
+
+    # Arrays and long lists bypass the cache
+    utils.load_imbalance(np.array(dist))
+    utils.load_imbalance([1.0] * (utils._METRIC_CACHE_MAX_LEN + 1))
+    assert utils.load_imbalance.cache_info().currsize == 0
+    for i in range(utils._METRIC_CACHE_SIZE + 10):
+        utils.average_load([float(i)])
+    assert utils.average_load.cache_info().currsize == utils._METRIC_CACHE_SIZE
+    utils.clear_metric_cache()
+    assert utils.fairness_index.cache_info().currsize == 0
+
+
+def test_unflushed_rows_reach_disk_in_batches(tmp_path):
+    path = tmp_path / "results.csv"
+    for i in range(3):
+        utils.save_results_csv({"algorithm": "FCFS", "avg_waiting": i}, "Scheduling",
+                               filename=str(path), flush=False)
+    utils._RESULT_WRITERS[str(path)].flush()
+    with open(path, newline="") as f:
+        assert len(list(csv.reader(f))) == 4
+
+    with utils.ResultsCSVWriter(str(path), buffering=1 << 20, flush_rows=2) as writer:
+        writer.write("Scheduling", {"avg_waiting": 3})
+        writer.write("Scheduling", {"avg_waiting": 4})
+        with open(path, newline="") as f:
+            assert len(list(csv.reader(f))) == 6
+
+
+def test_extras_column_collects_unknown_fields_without_rewriting(tmp_path):
+    path = tmp_path / "results.csv"
+    with utils.ResultsCSVWriter(str(path), headers=["phase", "algorithm"]) as writer:
+        writer.write("Scheduling", {"algorithm": "FCFS"})
+
+    # The existing file gains the extras column once, then rows only append
+    with utils.ResultsCSVWriter(str(path), extras_column="extras") as writer:
+        writer.write("Scheduling", {"algorithm": "SJF", "late": [1, 2]})
+        writer.write("Scheduling", {"algorithm": "HRRN", "other": 3})
+        assert writer.headers == ["phase", "algorithm", "extras"]
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["phase", "algorithm", "extras"]
+    assert rows[1] == ["Scheduling", "FCFS", ""]
+    assert json.loads(rows[2][2]) == {"late": [1, 2]}
+    assert json.loads(rows[3][2]) == {"other": 3}
+    assert not (tmp_path / "results.csv.tmp").exists()
+
+
+def test_transfer_helpers():
+    Q = utils.init_transfer_q(np.array([0.0, 1.0, 0.5]), 5, transfer_ratio=0.5)
+    assert isinstance(Q, list) and Q == pytest.approx([0.5, 1.0, 0.75, 1.0, 1.0])
+    assert utils.init_transfer_q([2.0, 2.0], 1) == pytest.approx([1.7])
+    assert utils.transfer_effectiveness([1.0, 0.0, 9.0], np.array([0.5, 0.5])) == pytest.approx(0.5)
+    assert utils.transfer_effectiveness([], [1.0]) == 0.0
+
+
+def test_random_delays_stay_in_range_and_follow_the_seed():
+    delays = utils.random_delays(1, 1000, variation=3, allow_negative=True, seed=7)
+    assert delays.dtype == np.int64 and delays.shape == (1000,)
+    assert delays.min() == 0 and delays.max() == 4
+    assert np.array_equal(delays, utils.random_delays(1, 1000, variation=3, allow_negative=True, seed=7))
+    assert set(utils.random_delays(5, 200).tolist()) <= {5, 6, 7}
+
+
+def test_iot_batch_score_matches_the_scalar_score():
+    features = np.array([[0.5, 20.0, 3.0], [0.9, 5.0, 0.0], [0.0, 0.0, 0.0]])
+    scores = utils.iot_load_score_batch(features, w_queue=0.5)
+    assert scores.tolist() == pytest.approx([utils.iot_load_score(*row, w_queue=0.5) for row in features])
+    with pytest.raises(ValueError):
+        utils.iot_load_score_batch([1.0, 2.0, 3.0])
+    assert utils.aggregate_iot_signals({"latency": 40.0, "cpu_temp": 60.0}) == 50.0
+    assert utils.aggregate_iot_signals({}) == 0.0
+
+
+def test_fused_stats_kernel_matches_numpy_reductions():
+    arr = np.random.default_rng(3).normal(5.0, 2.0, 1001)
+    for a in (arr, arr[::3], arr[:1]):
+        assert utils._distribution_stats_kernel(a) == pytest.approx(utils._distribution_stats(a))
+
+
+def test_random_delay_clamps_at_zero():
+    assert all(utils.random_delay(0, 3, allow_negative=True) >= 0 for _ in range(200))
+    assert {utils.random_delay(10, 1) for _ in range(200)} <= {10, 11}
+
+
+def test_distribution_aggregator_matches_the_batch_metrics():
+    samples = np.random.default_rng(5).uniform(1e6, 1e6 + 1, 500)
+    streamed = utils.DistributionAggregator()
+    for x in samples:
+        streamed.add(float(x))
+    batched = utils.DistributionAggregator()
+    batched.extend(samples[:123])
+    batched.extend(samples[123:])
+
+    # Welford keeps the variance of offset samples accurate
+    expected = utils.compute_distribution_metrics(samples)
+    assert expected["variance"] == pytest.approx(samples.var(), rel=1e-9)
+    assert streamed.metrics() == pytest.approx(expected, rel=1e-9)
+    assert batched.metrics() == pytest.approx(expected, rel=1e-9)
+    assert utils.DistributionAggregator().metrics() == utils.compute_distribution_metrics([])
+
+
+def test_helpers_read_array_module_buffers_without_copying():
+    loads = array.array("d", [2.0, 4.0, 6.0])
+    assert np.shares_memory(utils._as_array(loads), np.frombuffer(loads))
+    assert utils.average_load(loads) == 4.0
+    assert utils.compute_distribution_metrics(loads)["max_load"] == 6.0
+
+
+def test_p2c_picks_the_better_of_the_sampled_nodes():
+    scores = np.array([5.0, 1.0, 3.0, 4.0])
+    idxs = np.random.default_rng(11).choice(4, size=2, replace=False)
+    assert utils.select_node_p2c(scores, seed=11) == idxs[np.argmin(scores[idxs])]
+    assert utils.select_node_p2c_by(4, scores.__getitem__, seed=11) == idxs[np.argmin(scores[idxs])]
+    assert utils.select_node_p2c(scores, k=200, seed=0) == 1
+
+    # Picking by current load spreads requests evenly
+    loads = np.zeros(50)
+    for i in range(5000):
+        loads[utils.select_node_p2c(loads)] += 1
+    assert loads.max() - loads.min() <= 10
+    with pytest.raises(ValueError):
+        utils.select_node_p2c([])
+
+
+def test_p2c_candidates_are_distinct():
+    # With two nodes both are always compared, so the better one always wins
+    assert all(utils.select_node_p2c([2.0, 1.0], seed=s) == 1 for s in range(200))
+    seen = []
+    utils.select_node_p2c_by(2, lambda i: seen.append(i) or i, seed=5)
+    assert sorted(seen) == [0, 1]
+    assert utils.select_node_p2c([3.0], k=4) == 0
+
+
+def test_resource_score_clamps_overcommitted_resources():
+    assert utils.resource_score(4.0, 8.0, used_cpu=1.0, used_mem=2.0, mem_weight=0.5) == 6.0
+    assert utils.resource_score(4.0, 8.0, used_cpu=6.0, used_mem=10.0) == 0.0
+    assert utils.resource_score(2, 2, used_cpu=1) == 3
+
+
+def test_save_results_csv_applies_extras_column_to_a_cached_writer(tmp_path):
+    path = str(tmp_path / "results.csv")
+    utils.save_results_csv({"algorithm": "FCFS"}, "Scheduling", filename=path, headers=["phase", "algorithm"])
+    utils.save_results_csv({"zz": [1]}, "Scheduling", filename=path, extras_column="extra")
+    utils.save_results_csv({"algorithm": "SJF", "yy": 2}, "Scheduling", filename=path, extras_column="extra")
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["phase", "algorithm", "extra"]
+    assert json.loads(rows[2][2]) == {"zz": [1]}
+    assert rows[3][:2] == ["Scheduling", "SJF"] and json.loads(rows[3][2]) == {"yy": 2}
+    utils.close_results_writers()